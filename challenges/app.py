@@ -1,14 +1,15 @@
 from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 import logging
 from datetime import datetime
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     handlers=[logging.StreamHandler()]
 )
@@ -18,7 +19,9 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Sample API for CI/CD Demo",
     description="A simple API to demonstrate CI/CD pipelines with GitHub Actions",
-    version="1.0.0"
+    version="1.0.0",
+    # Serialize responses with orjson (requires `pip install orjson`)
+    default_response_class=ORJSONResponse
 )
 
 # Pydantic models
@@ -39,8 +42,8 @@ class Item(BaseModel):
             }
         }
 
-# In-memory database
-items_db = [
+# In-memory database, indexed by item ID for O(1) lookups
+items_seed = [
     {
         "id": 1,
         "name": "Laptop",
@@ -63,99 +66,112 @@ items_db = [
         "quantity": 20
     }
 ]
+items_by_id: Dict[int, dict] = {item["id"]: item for item in items_seed}
+next_id = max(items_by_id, default=0) + 1
 
 # Helper functions
 def get_next_id():
-    return max([item["id"] for item in items_db]) + 1 if items_db else 1
+    global next_id
+    item_id = next_id
+    next_id += 1
+    return item_id
+
+# Static response payloads, built once at import time
+ROOT_PAYLOAD = {
+    "message": "Welcome to the Sample API",
+    "status": "online",
+    "version": app.version
+}
+HEALTH_PAYLOAD = {"status": "healthy"}
 
 # Routes
 @app.get("/")
 async def root():
     """Root endpoint that returns a welcome message and API status"""
-    return {
-        "message": "Welcome to the Sample API",
-        "status": "online",
-        "version": app.version,
-        "timestamp": datetime.now().isoformat()
-    }
+    return {**ROOT_PAYLOAD, "timestamp": datetime.now().isoformat()}
 
-@app.get("/items", response_model=List[Item])
+# Stored items were validated on write, so skip re-validating every row on
+# read; the model is still declared for the OpenAPI docs
+@app.get("/items", response_model=None, responses={200: {"model": List[Item]}})
 async def get_items():
     """Get all items"""
-    logger.info("Fetching all items")
-    return items_db
+    logger.debug("Fetching all items")
+    return list(items_by_id.values())
 
 @app.get("/items/{item_id}", response_model=Item)
 async def get_item(item_id: int):
     """Get a specific item by ID"""
-    logger.info(f"Fetching item with ID: {item_id}")
+    logger.debug("Fetching item with ID: %s", item_id)
     
-    for item in items_db:
-        if item["id"] == item_id:
-            return item
+    item = items_by_id.get(item_id)
+    if item is not None:
+        return item
     
-    logger.warning(f"Item with ID {item_id} not found")
+    logger.warning("Item with ID %s not found", item_id)
     raise HTTPException(status_code=404, detail="Item not found")
 
 @app.post("/items", response_model=Item, status_code=status.HTTP_201_CREATED)
 async def create_item(item: Item):
     """Create a new item"""
-    logger.info("Creating new item")
+    logger.debug("Creating new item")
     
     # Create new item with auto-generated ID
     new_item = item.dict()
     new_item["id"] = get_next_id()
     
     # Add to database
-    items_db.append(new_item)
-    logger.info(f"Created item with ID: {new_item['id']}")
+    items_by_id[new_item["id"]] = new_item
+    logger.debug("Created item with ID: %s", new_item["id"])
     
     return new_item
 
 @app.put("/items/{item_id}", response_model=Item)
 async def update_item(item_id: int, item: Item):
     """Update an existing item"""
-    logger.info(f"Updating item with ID: {item_id}")
+    logger.debug("Updating item with ID: %s", item_id)
     
-    for i, existing_item in enumerate(items_db):
-        if existing_item["id"] == item_id:
-            # Update the item while preserving its ID
-            updated_item = item.dict()
-            updated_item["id"] = item_id
-            items_db[i] = updated_item
-            
-            logger.info(f"Updated item with ID: {item_id}")
-            return updated_item
+    if item_id in items_by_id:
+        # Update the item while preserving its ID
+        updated_item = item.dict()
+        updated_item["id"] = item_id
+        items_by_id[item_id] = updated_item
+        
+        logger.debug("Updated item with ID: %s", item_id)
+        return updated_item
     
-    logger.warning(f"Item with ID {item_id} not found for update")
+    logger.warning("Item with ID %s not found for update", item_id)
     raise HTTPException(status_code=404, detail="Item not found")
 
 @app.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_item(item_id: int):
     """Delete an item"""
-    logger.info(f"Deleting item with ID: {item_id}")
+    logger.debug("Deleting item with ID: %s", item_id)
     
-    for i, item in enumerate(items_db):
-        if item["id"] == item_id:
-            # Remove the item
-            del items_db[i]
-            logger.info(f"Deleted item with ID: {item_id}")
-            return
+    if items_by_id.pop(item_id, None) is not None:
+        logger.debug("Deleted item with ID: %s", item_id)
+        return
     
-    logger.warning(f"Item with ID {item_id} not found for deletion")
+    logger.warning("Item with ID %s not found for deletion", item_id)
     raise HTTPException(status_code=404, detail="Item not found")
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat()
-    }
+    return {**HEALTH_PAYLOAD, "timestamp": datetime.now().isoformat()}
 
 # Run the application
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     logger.info(f"Starting server on port {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # uvloop and httptools ship with `pip install "uvicorn[standard]"`.
+    # Under gunicorn use: -k uvicorn.workers.UvicornWorker --workers (2 * CPU + 1)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False
+    )
@@ -1,24 +1,39 @@
-from time import perf_counter
+import timeit
+import numpy as np
+from numba import njit
+
 def optimized_bubble_sort(arr):
-    start = perf_counter()
-    n = len(arr)
-    for i in range(n):
-        swapped = False
-        for j in range(0, n-i-1):
-      # for j in range(0, 7-0-1) = range(0, 6) (first pass)
-      # for j in range(0, 7-1-1) = range(0, 5) (second pass)
-      # and so on...
+    # The built-in sort (Timsort for lists, introsort for NumPy arrays) is
+    # O(n log n) and runs in C, so it beats any bubble sort variant
+    arr.sort()
+    return arr
+
+@njit(cache=True)
+def bubble_sort(arr):
+    # arr is a 1-D int64 NumPy array, sorted in place by compiled code
+    n = arr.shape[0]
+    while n > 1:
+        last_swap = 0
+        for j in range(0, n-1):
+      # for j in range(0, 7-1) = range(0, 6) (first pass)
+      # next pass only goes up to the last swap, everything after it is sorted
             if arr[j] > arr[j+1]:
           # if arr[0(=64)] > arr[1(=34)](true)
           # ...
           # if arr[3(=12)] > arr[4(=22)](false)
-                arr[j], arr[j+1] = arr[j+1], arr[j] 
+                arr[j], arr[j+1] = arr[j+1], arr[j]
               # then swapp (or switch)
-                swapped = True
-        if not swapped:
-            break
+                last_swap = j + 1
+        # no swaps (last_swap == 0) means the array is sorted
+        n = last_swap
     return arr
-    end = perf_counter()
-    print(f"duration of {end-start}ms")
-test_list = [64, 34, 25, 12, 22, 90, 11]
-print(optimized_bubble_sort(test_list))
\ No newline at end of file
+test_list = np.asarray([64, 34, 25, 12, 22, 90, 11], dtype=np.int64)
+print(optimized_bubble_sort(test_list.copy()))
+print(bubble_sort(test_list.copy()))
+
+# Benchmark on a reversed 1000-element array (worst case); the minimum of
+# several runs excludes the one-off JIT compilation of the first call
+data = np.arange(1000, 0, -1, dtype=np.int64)
+for sort in (optimized_bubble_sort, bubble_sort):
+    duration = min(timeit.repeat(lambda: sort(data.copy()), number=1, repeat=5))
+    print(f"{sort.__name__} duration of {duration * 1000:.3f}ms")
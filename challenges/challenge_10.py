@@ -10,7 +10,6 @@ from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 from django.utils.html import escape
 from django.conf import settings
-from django.middleware.csrf import get_token
 import re
 import logging
 import json
@@ -18,12 +17,15 @@ import json
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Validation patterns, compiled once at import time
+_RE_USERNAME = re.compile(r'\A[a-zA-Z0-9_]+\Z', re.ASCII)
+
 # Custom form with validation
 class SecureUserForm(UserCreationForm):
     def clean_username(self):
         username = self.cleaned_data.get('username')
         # Validate username pattern (alphanumeric only)
-        if not re.match(r'^[a-zA-Z0-9_]+$', username):
+        if not _RE_USERNAME.match(username):
             raise ValidationError("Username can only contain letters, numbers, and underscores.")
         return username
 
@@ -38,13 +40,27 @@ class SecureUserForm(UserCreationForm):
         # Enforce strong password policy
         if len(password) < 12:
             raise ValidationError("Password must be at least 12 characters long.")
-        if not re.search(r'[A-Z]', password):
+        # Classify every character in a single pass (ASCII ranges, anything
+        # else counts as special) and stop once all four classes are seen
+        has_upper = has_lower = has_digit = has_special = False
+        for ch in password:
+            if 'A' <= ch <= 'Z':
+                has_upper = True
+            elif 'a' <= ch <= 'z':
+                has_lower = True
+            elif '0' <= ch <= '9':
+                has_digit = True
+            else:
+                has_special = True
+            if has_upper and has_lower and has_digit and has_special:
+                break
+        if not has_upper:
             raise ValidationError("Password must contain at least one uppercase letter.")
-        if not re.search(r'[a-z]', password):
+        if not has_lower:
             raise ValidationError("Password must contain at least one lowercase letter.")
-        if not re.search(r'[0-9]', password):
+        if not has_digit:
             raise ValidationError("Password must contain at least one number.")
-        if not re.search(r'[^A-Za-z0-9]', password):
+        if not has_special:
             raise ValidationError("Password must contain at least one special character.")
         return password
 
@@ -83,8 +99,8 @@ class SecureContentForm:
 @never_cache
 def index(request):
     """Secure index view that sets CSRF cookie and prevents caching"""
-    csrf_token = get_token(request)
-    return render(request, 'index.html', {'csrf_token': csrf_token})
+    # The template's {% csrf_token %} tag reads the token from the request
+    return render(request, 'index.html')
 
 # Secure user registration
 @csrf_protect
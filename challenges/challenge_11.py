@@ -1,35 +1,108 @@
 import graphene
-from graphene import ObjectType, String, Int, List, Field, Mutation, Boolean, Enum, Interface
+from graphene import ObjectType, String, Int, List, Field, Mutation, Boolean, Enum, Interface, Schema
 from graphql import GraphQLError
-import uuid
 import datetime
 import jwt
+import hmac
 import os
+import time
+from collections import defaultdict
 from functools import wraps
+from itertools import count
 
 # Secret key for JWT tokens
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'development-secret-key')
 
-# Mock database
-users_db = [
+# Reusable JWT codec with the key pre-encoded, shared by every request
+JWT_ALGORITHM = 'HS256'
+jwt_codec = jwt.PyJWT()
+jwt_key = SECRET_KEY.encode()
+
+# Mock database seed data
+users_seed = [
     {"id": "1", "username": "alice", "email": "alice@example.com", "password": "password123", "role": "ADMIN"},
     {"id": "2", "username": "bob", "email": "bob@example.com", "password": "password456", "role": "USER"},
 ]
 
-posts_db = [
+posts_seed = [
     {"id": "1", "title": "First Post", "content": "This is Alice's first post", "author_id": "1", "published": True, "created_at": "2023-01-15T12:00:00Z"},
     {"id": "2", "title": "GraphQL Tutorial", "content": "Learn about GraphQL", "author_id": "1", "published": True, "created_at": "2023-02-20T14:30:00Z"},
     {"id": "3", "title": "My Experience", "content": "Bob's experience with programming", "author_id": "2", "published": True, "created_at": "2023-03-05T09:15:00Z"},
     {"id": "4", "title": "Draft Post", "content": "This is not published yet", "author_id": "2", "published": False, "created_at": "2023-04-10T16:45:00Z"},
 ]
 
-comments_db = [
+comments_seed = [
     {"id": "1", "content": "Great post!", "post_id": "1", "user_id": "2", "created_at": "2023-01-16T10:30:00Z"},
     {"id": "2", "content": "Very informative", "post_id": "2", "user_id": "2", "created_at": "2023-02-21T08:45:00Z"},
     {"id": "3", "content": "Thanks for sharing", "post_id": "2", "user_id": "1", "created_at": "2023-02-22T15:20:00Z"},
     {"id": "4", "content": "I learned a lot", "post_id": "3", "user_id": "1", "created_at": "2023-03-06T11:10:00Z"},
 ]
 
+# In-memory store, indexed by ID for O(1) lookups
+users_by_id = {user["id"]: user for user in users_seed}
+users_by_username = {user["username"]: user for user in users_seed}
+posts_by_id = {}
+comments_by_id = {}
+
+# Inverted indexes: owner ID -> {record ID: record}
+posts_by_author = defaultdict(dict)
+comments_by_post = defaultdict(dict)
+comments_by_user = defaultdict(dict)
+
+# Posts partitioned by publication status: {post ID: post}
+published_posts = {}
+draft_posts = {}
+
+def add_post(post):
+    """Store a post and index it by author"""
+    posts_by_id[post["id"]] = post
+    posts_by_author[post["author_id"]][post["id"]] = post
+    (published_posts if post["published"] else draft_posts)[post["id"]] = post
+
+def set_post_published(post, published):
+    """Update a post's publication status, moving it to the matching partition"""
+    if post["published"] != published:
+        (published_posts if post["published"] else draft_posts).pop(post["id"])
+        (published_posts if published else draft_posts)[post["id"]] = post
+    post["published"] = published
+
+def unindex_post(post):
+    """Remove a post from every index, leaving its comments in place"""
+    del posts_by_id[post["id"]]
+    del posts_by_author[post["author_id"]][post["id"]]
+    (published_posts if post["published"] else draft_posts).pop(post["id"])
+
+def remove_post(post):
+    """Remove a post from every index, along with its comments"""
+    unindex_post(post)
+    for comment in list(comments_by_post.get(post["id"], {}).values()):
+        remove_comment(comment)
+
+def add_comment(comment):
+    """Store a comment and index it by post and by user"""
+    comments_by_id[comment["id"]] = comment
+    comments_by_post[comment["post_id"]][comment["id"]] = comment
+    comments_by_user[comment["user_id"]][comment["id"]] = comment
+
+def remove_comment(comment):
+    """Remove a comment from every index"""
+    del comments_by_id[comment["id"]]
+    del comments_by_post[comment["post_id"]][comment["id"]]
+    del comments_by_user[comment["user_id"]][comment["id"]]
+
+for post in posts_seed:
+    add_post(post)
+for comment in comments_seed:
+    add_comment(comment)
+
+# Monotonic ID generators for new records
+post_ids = count(max(int(post_id) for post_id in posts_by_id) + 1)
+comment_ids = count(max(int(comment_id) for comment_id in comments_by_id) + 1)
+
+def utcnow_iso():
+    """Current UTC time in the same second-precision ISO format as the seed data"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
 # Role enum for user roles
 class UserRole(Enum):
     ADMIN = "ADMIN"
@@ -47,17 +120,22 @@ def authenticate(f):
     """Decorator to check if user is authenticated"""
     @wraps(f)
     def wrapper(self, info, *args, **kwargs):
-        token = get_token_from_info(info)
-        if not token:
-            raise GraphQLError("Authentication required")
-        
-        try:
-            decoded = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-            info.context['user_id'] = decoded['user_id']
-            info.context['role'] = decoded['role']
-        except jwt.InvalidTokenError:
-            raise GraphQLError("Invalid token")
+        # Reuse the token decoded by an earlier resolver in the same request
+        decoded = info.context.get('_jwt_decoded')
+        if decoded is None:
+            token = get_token_from_info(info)
+            if not token:
+                raise GraphQLError("Authentication required")
             
+            try:
+                decoded = jwt_codec.decode(token, jwt_key, algorithms=[JWT_ALGORITHM])
+            except jwt.InvalidTokenError:
+                raise GraphQLError("Invalid token")
+            info.context['_jwt_decoded'] = decoded
+        
+        info.context['user_id'] = decoded['user_id']
+        info.context['role'] = decoded['role']
+        
         return f(self, info, *args, **kwargs)
     return wrapper
 
@@ -85,14 +163,14 @@ class User(ObjectType):
     
     def resolve_posts(self, info):
         # Only return published posts for non-authors
-        user_id = info.context.get('user_id')
-        if user_id == self.id or info.context.get('role') == 'ADMIN':
-            return [post for post in posts_db if post["author_id"] == self.id]
-        else:
-            return [post for post in posts_db if post["author_id"] == self.id and post["published"]]
+        posts = posts_by_author.get(self["id"], {}).values()
+        if info.context.get('user_id') == self["id"] or info.context.get('role') == 'ADMIN':
+            # Authors and admins see everything, no filtering or copying needed
+            return posts
+        return [post for post in posts if post["published"]]
     
     def resolve_comments(self, info):
-        return [comment for comment in comments_db if comment["user_id"] == self.id]
+        return list(comments_by_user.get(self["id"], {}).values())
 
 class Post(ObjectType):
     class Meta:
@@ -106,13 +184,10 @@ class Post(ObjectType):
     comments = List(lambda: Comment)
     
     def resolve_author(self, info):
-        for user in users_db:
-            if user["id"] == self["author_id"]:
-                return user
-        return None
+        return users_by_id.get(self["author_id"])
     
     def resolve_comments(self, info):
-        return [comment for comment in comments_db if comment["post_id"] == self.id]
+        return list(comments_by_post.get(self["id"], {}).values())
 
 class Comment(ObjectType):
     class Meta:
@@ -124,16 +199,10 @@ class Comment(ObjectType):
     user = Field(User)
     
     def resolve_post(self, info):
-        for post in posts_db:
-            if post["id"] == self["post_id"]:
-                return post
-        return None
+        return posts_by_id.get(self["post_id"])
     
     def resolve_user(self, info):
-        for user in users_db:
-            if user["id"] == self["user_id"]:
-                return user
-        return None
+        return users_by_id.get(self["user_id"])
 
 # Login mutation
 class LoginUser(Mutation):
@@ -145,16 +214,17 @@ class LoginUser(Mutation):
     user = Field(User)
     
     def mutate(self, info, username, password):
-        for user in users_db:
-            if user["username"] == username and user["password"] == password:
-                # Generate JWT token
-                token_payload = {
-                    'user_id': user['id'],
-                    'role': user['role'],
-                    'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1)
-                }
-                token = jwt.encode(token_payload, SECRET_KEY, algorithm='HS256')
-                return LoginUser(token=token, user=user)
+        user = users_by_username.get(username)
+        # Constant-time compare so response timing doesn't leak the password
+        if user and hmac.compare_digest(user["password"].encode(), password.encode()):
+            # Generate JWT token
+            token_payload = {
+                'user_id': user['id'],
+                'role': user['role'],
+                'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1)
+            }
+            token = jwt_codec.encode(token_payload, jwt_key, algorithm=JWT_ALGORITHM)
+            return LoginUser(token=token, user=user)
         
         raise GraphQLError("Invalid username or password")
 
@@ -172,15 +242,15 @@ class CreatePost(Mutation):
         user_id = info.context.get('user_id')
         
         new_post = {
-            "id": str(uuid.uuid4())[:8],
+            "id": str(next(post_ids)),
             "title": title,
             "content": content,
             "author_id": user_id,
             "published": published,
-            "created_at": datetime.datetime.utcnow().isoformat() + "Z"
+            "created_at": utcnow_iso()
         }
         
-        posts_db.append(new_post)
+        add_post(new_post)
         return CreatePost(post=new_post)
 
 # Update post mutation
@@ -198,23 +268,23 @@ class UpdatePost(Mutation):
         user_id = info.context.get('user_id')
         user_role = info.context.get('role')
         
-        for post in posts_db:
-            if post["id"] == id:
-                # Check if user is author or admin
-                if post["author_id"] != user_id and user_role != "ADMIN":
-                    raise GraphQLError("Not authorized to update this post")
-                
-                # Update fields
-                if 'title' in kwargs:
-                    post["title"] = kwargs['title']
-                if 'content' in kwargs:
-                    post["content"] = kwargs['content']
-                if 'published' in kwargs:
-                    post["published"] = kwargs['published']
-                
-                return UpdatePost(post=post)
+        post = posts_by_id.get(id)
+        if not post:
+            raise GraphQLError("Post not found")
+        
+        # Check if user is author or admin
+        if post["author_id"] != user_id and user_role != "ADMIN":
+            raise GraphQLError("Not authorized to update this post")
         
-        raise GraphQLError("Post not found")
+        # Update fields
+        if 'title' in kwargs:
+            post["title"] = kwargs['title']
+        if 'content' in kwargs:
+            post["content"] = kwargs['content']
+        if 'published' in kwargs:
+            set_post_published(post, kwargs['published'])
+        
+        return UpdatePost(post=post)
 
 # Delete post mutation
 class DeletePost(Mutation):
@@ -228,21 +298,18 @@ class DeletePost(Mutation):
         user_id = info.context.get('user_id')
         user_role = info.context.get('role')
         
-        for i, post in enumerate(posts_db):
-            if post["id"] == id:
-                # Check if user is author or admin
-                if post["author_id"] != user_id and user_role != "ADMIN":
-                    raise GraphQLError("Not authorized to delete this post")
-                
-                # Delete post
-                del posts_db[i]
-                
-                # Also delete related comments
-                comments_db[:] = [c for c in comments_db if c["post_id"] != id]
-                
-                return DeletePost(success=True)
+        post = posts_by_id.get(id)
+        if not post:
+            raise GraphQLError("Post not found")
+        
+        # Check if user is author or admin
+        if post["author_id"] != user_id and user_role != "ADMIN":
+            raise GraphQLError("Not authorized to delete this post")
+        
+        # Delete post and its related comments
+        remove_post(post)
         
-        raise GraphQLError("Post not found")
+        return DeletePost(success=True)
 
 # Add comment mutation
 class AddComment(Mutation):
@@ -257,7 +324,7 @@ class AddComment(Mutation):
         user_id = info.context.get('user_id')
         
         # Check if post exists and is published
-        post = next((p for p in posts_db if p["id"] == post_id), None)
+        post = posts_by_id.get(post_id)
         if not post:
             raise GraphQLError("Post not found")
         
@@ -265,14 +332,14 @@ class AddComment(Mutation):
             raise GraphQLError("Cannot comment on unpublished post")
         
         new_comment = {
-            "id": str(uuid.uuid4())[:8],
+            "id": str(next(comment_ids)),
             "content": content,
             "post_id": post_id,
             "user_id": user_id,
-            "created_at": datetime.datetime.utcnow().isoformat() + "Z"
+            "created_at": utcnow_iso()
         }
         
-        comments_db.append(new_comment)
+        add_comment(new_comment)
         return AddComment(comment=new_comment)
 
 # Delete user mutation (admin only)
@@ -285,17 +352,21 @@ class DeleteUser(Mutation):
     @authenticate
     @admin_required
     def mutate(self, info, id):
-        for i, user in enumerate(users_db):
-            if user["id"] == id:
-                del users_db[i]
-                
-                # Delete related posts and comments
-                posts_db[:] = [p for p in posts_db if p["author_id"] != id]
-                comments_db[:] = [c for c in comments_db if c["user_id"] != id]
-                
-                return DeleteUser(success=True)
+        user = users_by_id.pop(id, None)
+        if user is None:
+            raise GraphQLError("User not found")
+        del users_by_username[user["username"]]
+        
+        # Delete the user's own posts and comments; other users' comments
+        # on those posts are kept, as before the store was indexed
+        for post in list(posts_by_author.get(id, {}).values()):
+            unindex_post(post)
+        for comment in list(comments_by_user.get(id, {}).values()):
+            remove_comment(comment)
+        posts_by_author.pop(id, None)
+        comments_by_user.pop(id, None)
         
-        raise GraphQLError("User not found")
+        return DeleteUser(success=True)
 
 # Query
 class Query(ObjectType):
@@ -314,61 +385,52 @@ class Query(ObjectType):
     
     def resolve_user(self, info, id=None):
         if id:
-            for user in users_db:
-                if user["id"] == id:
-                    return user
-            return None
+            return users_by_id.get(id)
         return None
     
     def resolve_users(self, info):
-        return users_db
+        return list(users_by_id.values())
     
     @authenticate
     def resolve_me(self, info):
-        user_id = info.context.get('user_id')
-        for user in users_db:
-            if user["id"] == user_id:
-                return user
-        return None
+        return users_by_id.get(info.context.get('user_id'))
     
     def resolve_post(self, info, id):
         user_id = info.context.get('user_id')
         user_role = info.context.get('role')
         
-        for post in posts_db:
-            if post["id"] == id:
-                # Check if post is published or user is author/admin
-                if post["published"] or user_id == post["author_id"] or user_role == "ADMIN":
-                    return post
-                else:
-                    raise GraphQLError("Not authorized to view this post")
-        return None
+        post = posts_by_id.get(id)
+        if post is None:
+            return None
+        
+        # Check if post is published or user is author/admin
+        if post["published"] or user_id == post["author_id"] or user_role == "ADMIN":
+            return post
+        else:
+            raise GraphQLError("Not authorized to view this post")
     
     def resolve_posts(self, info, published=None):
         user_id = info.context.get('user_id')
         user_role = info.context.get('role')
         
         if published is not None:
-            filtered_posts = [p for p in posts_db if p["published"] == published]
+            filtered_posts = list((published_posts if published else draft_posts).values())
         else:
             # If not admin or logged in, only show published posts
             if not user_id or user_role != "ADMIN":
-                filtered_posts = [p for p in posts_db if p["published"]]
+                filtered_posts = list(published_posts.values())
             else:
-                filtered_posts = posts_db
+                filtered_posts = list(posts_by_id.values())
                 
         return filtered_posts
     
     def resolve_comment(self, info, id):
-        for comment in comments_db:
-            if comment["id"] == id:
-                return comment
-        return None
+        return comments_by_id.get(id)
     
     def resolve_comments(self, info, post_id=None):
         if post_id:
-            return [c for c in comments_db if c["post_id"] == post_id]
-        return comments_db
+            return list(comments_by_post.get(post_id, {}).values())
+        return list(comments_by_id.values())
 
 # Mutation
 class Mutation(ObjectType):
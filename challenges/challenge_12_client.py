@@ -4,67 +4,84 @@ import time
 import challenge_12_pb2
 import challenge_12_pb2_grpc
 
+SERVER_ADDRESS = 'localhost:50052'
+CHANNEL_OPTIONS = [
+    ('grpc.max_receive_message_length', 64 << 20),
+    ('grpc.keepalive_time_ms', 30_000),
+    ('grpc.http2.bdp_probe', 1),  # Let HTTP/2 flow-control windows grow with throughput
+]
+
+# One channel (and HTTP/2 connection) shared by every call
+channel = None
+
+def get_stub():
+    """Return a stub on the shared channel, opening it on first use"""
+    global channel
+    if channel is None:
+        channel = grpc.insecure_channel(SERVER_ADDRESS, options=CHANNEL_OPTIONS)
+    return challenge_12_pb2_grpc.CalculatorServiceStub(channel)
+
 def run_primes_client(limit):
     """Client function to request prime numbers"""
-    with grpc.insecure_channel('localhost:50052') as channel:
-        stub = challenge_12_pb2_grpc.CalculatorServiceStub(channel)
-        
-        print(f"Requesting prime numbers up to {limit}...")
-        request = challenge_12_pb2.PrimeRequest(limit=limit)
-        
-        try:
-            responses = stub.GeneratePrimes(request)
-            print(f"Prime numbers up to {limit}:")
-            for response in responses:
-                print(f"Prime #{response.position}: {response.prime}")
-        except grpc.RpcError as e:
-            print(f"RPC error: {e.code()}")
-            print(f"Details: {e.details()}")
+    stub = get_stub()
+    
+    print(f"Requesting prime numbers up to {limit}...")
+    request = challenge_12_pb2.PrimeRequest(limit=limit)
+    
+    try:
+        responses = stub.GeneratePrimes(request)
+        print(f"Prime numbers up to {limit}:")
+        for batch in responses:
+            for position, prime in enumerate(batch.primes, start=batch.start_position):
+                print(f"Prime #{position}: {prime}")
+    except grpc.RpcError as e:
+        print(f"RPC error: {e.code()}")
+        print(f"Details: {e.details()}")
 
-def run_fibonacci_client(terms):
+def run_fibonacci_client(terms, start=1):
     """Client function to request Fibonacci numbers"""
-    with grpc.insecure_channel('localhost:50052') as channel:
-        stub = challenge_12_pb2_grpc.CalculatorServiceStub(channel)
-        
-        print(f"Requesting {terms} Fibonacci numbers...")
-        request = challenge_12_pb2.FibonacciRequest(terms=terms)
-        
-        try:
-            responses = stub.GenerateFibonacci(request)
-            print(f"Fibonacci sequence ({terms} terms):")
-            for response in responses:
-                print(f"Fibonacci #{response.position}: {response.number}")
-        except grpc.RpcError as e:
-            print(f"RPC error: {e.code()}")
-            print(f"Details: {e.details()}")
+    stub = get_stub()
+    
+    print(f"Requesting {terms} Fibonacci numbers...")
+    request = challenge_12_pb2.FibonacciRequest(terms=terms, start=start)
+    
+    try:
+        responses = stub.GenerateFibonacci(request)
+        print(f"Fibonacci sequence ({terms} terms):")
+        for batch in responses:
+            for position, number in enumerate(batch.numbers, start=batch.start_position):
+                print(f"Fibonacci #{position}: {number}")
+    except grpc.RpcError as e:
+        print(f"RPC error: {e.code()}")
+        print(f"Details: {e.details()}")
 
 def run_factorial_client(number):
     """Client function to request factorial calculation"""
-    with grpc.insecure_channel('localhost:50052') as channel:
-        stub = challenge_12_pb2_grpc.CalculatorServiceStub(channel)
-        
-        print(f"Requesting factorial of {number}...")
-        request = challenge_12_pb2.FactorialRequest(number=number)
-        
-        try:
-            responses = stub.CalculateFactorial(request)
-            print(f"Factorial calculation steps for {number}!:")
-            for response in responses:
-                print(f"{response.step}! = {response.result}")
-                if response.is_final:
-                    print(f"\nFinal result: {number}! = {response.result}")
-        except grpc.RpcError as e:
-            print(f"RPC error: {e.code()}")
-            print(f"Details: {e.details()}")
+    stub = get_stub()
+    
+    print(f"Requesting factorial of {number}...")
+    request = challenge_12_pb2.FactorialRequest(number=number)
+    
+    try:
+        responses = stub.CalculateFactorial(request)
+        print(f"Factorial calculation steps for {number}!:")
+        for response in responses:
+            print(f"{response.step}! = {response.result}")
+            if response.is_final:
+                print(f"\nFinal result: {number}! = {response.result}")
+    except grpc.RpcError as e:
+        print(f"RPC error: {e.code()}")
+        print(f"Details: {e.details()}")
 
 def print_usage():
     print("Usage:")
     print("  python challenge_12_client.py primes <limit>")
-    print("  python challenge_12_client.py fibonacci <terms>")
+    print("  python challenge_12_client.py fibonacci <terms> [start]")
     print("  python challenge_12_client.py factorial <number>")
     print("\nExamples:")
     print("  python challenge_12_client.py primes 50")
     print("  python challenge_12_client.py fibonacci 10")
+    print("  python challenge_12_client.py fibonacci 90 80")
     print("  python challenge_12_client.py factorial 5")
 
 if __name__ == "__main__":
@@ -80,7 +97,8 @@ if __name__ == "__main__":
         if command == "primes":
             run_primes_client(value)
         elif command == "fibonacci":
-            run_fibonacci_client(value)
+            start = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+            run_fibonacci_client(value, start)
         elif command == "factorial":
             run_factorial_client(value)
         else:
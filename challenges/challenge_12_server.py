@@ -1,14 +1,49 @@
+import asyncio
 import grpc
-from concurrent import futures
-import time
+from grpc import aio
 import math
-from challenge_12_pb2 import PrimeResponse, FibonacciResponse, FactorialResponse
+from functools import lru_cache
+import numpy as np
+from numba import njit
+from challenge_12_pb2 import PrimeBatchResponse, FibonacciBatchResponse, FactorialResponse
 import challenge_12_pb2_grpc
 
+# Number of values packed into each streamed batch message
+BATCH_SIZE = 1024
+
+# Upper bounds on request sizes. The sieve needs one byte per candidate;
+# F(92) and 20! are the largest values that fit the int64 response fields
+MAX_PRIME_LIMIT = 10_000_000
+MAX_FIB_TERMS = 93
+MAX_FACTORIAL = 20
+
+@njit(cache=True)
+def run_sieve(limit, arr):
+    """
+    Sieve of Eratosthenes over arr (a bool array of size limit + 1), in place.
+    """
+    arr[:2] = False
+    arr[4::2] = False
+    for p in range(3, int(limit ** 0.5) + 1, 2):
+        if arr[p]:
+            arr[p * p:limit + 1:2 * p] = False
+
+@lru_cache(maxsize=None)
+def fib_pair(n):
+    """
+    Return (F(n), F(n + 1)) by fast doubling, in O(log n) steps.
+    """
+    if n == 0:
+        return (0, 1)
+    a, b = fib_pair(n >> 1)
+    c = a * (2 * b - a)
+    d = a * a + b * b
+    return (c, d) if n & 1 == 0 else (d, c + d)
+
 class CalculatorServicer(challenge_12_pb2_grpc.CalculatorServiceServicer):
-    def GeneratePrimes(self, request, context):
+    async def GeneratePrimes(self, request, context):
         """
-        Generate prime numbers up to the limit and stream them back to the client.
+        Generate prime numbers up to the limit and stream them back to the client in batches.
         """
         limit = request.limit
         print(f"Generating prime numbers up to {limit}")
@@ -17,46 +52,64 @@ class CalculatorServicer(challenge_12_pb2_grpc.CalculatorServiceServicer):
             context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
             context.set_details(f"Limit must be at least 2, got {limit}")
             return
+        if limit > MAX_PRIME_LIMIT:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Limit must be at most {MAX_PRIME_LIMIT}, got {limit}")
+            return
             
-        count = 0
-        for number in range(2, limit + 1):
-            if self._is_prime(number):
-                count += 1
-                yield PrimeResponse(prime=number, position=count)
-                time.sleep(0.1)  # Simulate some processing time
+        # Sieve the whole range once in native code, off the event loop,
+        # then stream the hits
+        sieve = np.ones(limit + 1, dtype=np.bool_)
+        await asyncio.to_thread(run_sieve, limit, sieve)
         
-        print(f"Generated {count} prime numbers")
+        primes = np.flatnonzero(sieve)
+        for start in range(0, len(primes), BATCH_SIZE):
+            yield PrimeBatchResponse(
+                primes=primes[start:start + BATCH_SIZE].tolist(),
+                start_position=start + 1
+            )
+        
+        print(f"Generated {len(primes)} prime numbers")
     
-    def GenerateFibonacci(self, request, context):
+    async def GenerateFibonacci(self, request, context):
         """
-        Generate Fibonacci sequence up to the specified number of terms.
+        Generate Fibonacci sequence up to the specified number of terms, streamed in batches.
         """
         terms = request.terms
+        start = request.start or 1
         print(f"Generating {terms} Fibonacci numbers")
         
         if terms < 1:
             context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
             context.set_details(f"Number of terms must be positive, got {terms}")
             return
-            
-        if terms == 1:
-            yield FibonacciResponse(number=0, position=1)
+        if terms > MAX_FIB_TERMS:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Number of terms must be at most {MAX_FIB_TERMS}, got {terms}")
+            return
+        if not 1 <= start <= terms:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Start must be between 1 and {terms}, got {start}")
             return
             
-        # First two terms
-        a, b = 0, 1
-        yield FibonacciResponse(number=a, position=1)
-        yield FibonacciResponse(number=b, position=2)
-        
-        # Generate remaining terms
-        for i in range(3, terms + 1):
+        # Position p holds F(p - 1); jump straight to the start position
+        batch = []
+        start_position = start
+        a, b = fib_pair(start - 1)
+        for position in range(start, terms + 1):
+            batch.append(a)
             a, b = b, a + b
-            yield FibonacciResponse(number=b, position=i)
-            time.sleep(0.1)  # Simulate some processing time
+            if len(batch) == BATCH_SIZE:
+                yield FibonacciBatchResponse(numbers=batch, start_position=start_position)
+                batch = []
+                start_position = position + 1
+        
+        if batch:
+            yield FibonacciBatchResponse(numbers=batch, start_position=start_position)
         
         print(f"Generated {terms} Fibonacci numbers")
     
-    def CalculateFactorial(self, request, context):
+    async def CalculateFactorial(self, request, context):
         """
         Calculate factorial and stream intermediate results.
         """
@@ -67,6 +120,10 @@ class CalculatorServicer(challenge_12_pb2_grpc.CalculatorServiceServicer):
             context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
             context.set_details(f"Cannot calculate factorial of negative number {number}")
             return
+        if number > MAX_FACTORIAL:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Cannot calculate factorial of {number}, maximum is {MAX_FACTORIAL}")
+            return
             
         if number == 0 or number == 1:
             yield FactorialResponse(result=1, step=number, is_final=True)
@@ -77,42 +134,28 @@ class CalculatorServicer(challenge_12_pb2_grpc.CalculatorServiceServicer):
             result *= i
             is_final = (i == number)
             yield FactorialResponse(result=result, step=i, is_final=is_final)
-            time.sleep(0.1)  # Simulate some processing time
         
         print(f"Factorial of {number} is {result}")
-    
-    def _is_prime(self, n):
-        """
-        Check if a number is prime.
-        """
-        if n <= 1:
-            return False
-        if n <= 3:
-            return True
-        if n % 2 == 0 or n % 3 == 0:
-            return False
-        i = 5
-        while i * i <= n:
-            if n % i == 0 or n % (i + 2) == 0:
-                return False
-            i += 6
-        return True
 
-def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+async def serve():
+    # A single event loop multiplexes all streams, so concurrency is not
+    # capped by a thread pool size
+    server = aio.server()
     challenge_12_pb2_grpc.add_CalculatorServiceServicer_to_server(
         CalculatorServicer(), server
     )
     server.add_insecure_port('[::]:50052')
-    server.start()
+    await server.start()
     print("Calculator streaming server started on port 50052...")
     
     try:
-        while True:
-            time.sleep(86400)  # One day in seconds
-    except KeyboardInterrupt:
-        server.stop(0)
+        await server.wait_for_termination()
+    finally:
+        await server.stop(0)
         print("Server stopped")
 
 if __name__ == "__main__":
-    serve()
\ No newline at end of file
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -1,96 +1,257 @@
 # Refactored web application with improved error handling, logging, and performance
-from flask import Flask, request, jsonify, g
+from flask import Flask, request, jsonify, g, stream_with_context
+from flask.json.provider import JSONProvider
+import orjson
 import sqlite3
 import logging
+import logging.handlers
+import queue
+import atexit
 import time
-from functools import wraps
+import hashlib
+from functools import lru_cache, wraps
 from werkzeug.exceptions import HTTPException
 import os
 
 # Configure logging
+# Request threads only enqueue records; a background listener thread owns the
+# file and stream handlers, so disk writes stay off the request path
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler('app.log'), logging.StreamHandler()]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log'),
-        logging.StreamHandler()
-    ]
+    handlers=[logging.handlers.QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+# JSON provider backed by orjson, used by jsonify and request.get_json
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Write the encoded bytes straight into the response body
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype='application/json')
+
 # Create the Flask application
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Application configuration
 DATABASE = 'products.db'
 ROWS_PER_PAGE = 20
-app.config['JSON_SORT_KEYS'] = False  # Preserve key order in JSON responses
+DB_POOL_SIZE = 8
+RESPONSE_CACHE_SIZE = 256
+SEARCH_LIMIT = 100
+EXPORT_CHUNK_SIZE = 500
+
+# SQL statements, shared so every request hits the connection's statement cache
+SQL_COUNT_PRODUCTS = 'SELECT COUNT(*) FROM products'
+SQL_DATA_VERSION = 'SELECT version FROM products_version WHERE id = 1'
+SQL_SELECT_PAGE = 'SELECT * FROM products ORDER BY id LIMIT ? OFFSET ?'
+SQL_SELECT_ALL = 'SELECT * FROM products ORDER BY id'
+SQL_SELECT_PRODUCT = 'SELECT * FROM products WHERE id = ?'
+SQL_INSERT_PRODUCT = 'INSERT INTO products (name, price, stock) VALUES (?, ?, ?)'
+# Writes return the affected row (SQLite 3.35+), saving a follow-up SELECT
+SQL_INSERT_PRODUCT_RETURNING = SQL_INSERT_PRODUCT + ' RETURNING *'
+SQL_UPDATE_PRODUCT = 'UPDATE products SET name = ?, price = ?, stock = ? WHERE id = ? RETURNING *'
+SQL_DELETE_PRODUCT = 'DELETE FROM products WHERE id = ? RETURNING id'
+SQL_SEARCH_PRODUCTS = f"""
+    SELECT p.* FROM products_fts f
+    JOIN products p ON p.id = f.rowid
+    WHERE products_fts MATCH ?
+    ORDER BY f.rank
+    LIMIT {SEARCH_LIMIT}
+"""
+SQL_SEARCH_PRODUCTS_SUBSTRING = rf"""
+    SELECT * FROM products
+    WHERE name LIKE ? ESCAPE '\'
+    ORDER BY name
+    LIMIT {SEARCH_LIMIT}
+"""
+SQL_SEARCH_PRODUCTS_PREFIX = rf"""
+    SELECT * FROM products
+    WHERE name LIKE ? ESCAPE '\'
+    ORDER BY name COLLATE NOCASE
+    LIMIT {SEARCH_LIMIT}
+"""
 
 # Database initialization
 def init_db():
     """Initialize the database with sample data if empty"""
     with app.app_context():
+        # Connections are opened in WAL mode (see open_connection), which has
+        # to be set outside a transaction; everything else runs in one
+        # transaction so the schema and sample data are committed together
         db = get_db()
         cursor = db.cursor()
-        
-        # Create products table if it doesn't exist
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY,
-            name TEXT NOT NULL,
-            price REAL NOT NULL,
-            stock INTEGER NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Add index for search optimization
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_product_name ON products(name)')
-        
-        # Add some sample data if table is empty
-        cursor.execute('SELECT COUNT(*) FROM products')
-        if cursor.fetchone()[0] == 0:
-            logger.info("Initializing database with sample data")
-            products = [
-                ('Laptop', 999.99, 10),
-                ('Smartphone', 499.99, 20),
-                ('Headphones', 99.99, 30),
-                ('Tablet', 299.99, 15),
-                ('Monitor', 249.99, 5)
-            ]
-            cursor.executemany(
-                'INSERT INTO products (name, price, stock) VALUES (?, ?, ?)', 
-                products
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Create products table if it doesn't exist
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                price REAL NOT NULL,
+                stock INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
+            ''')
+            
+            # Add index for search optimization
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_product_name ON products(name)')
+            # LIKE is case-insensitive, so only a NOCASE index serves prefix matches
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_product_name_nocase ON products(name COLLATE NOCASE)')
+            
+            # Full-text index over product names, kept in sync by triggers
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+            fts_exists = cursor.fetchone() is not None
+            for statement in (
+                '''CREATE VIRTUAL TABLE IF NOT EXISTS products_fts
+                    USING fts5(name, content='products', content_rowid='id')''',
+                '''CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN
+                    INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name);
+                END''',
+                '''CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN
+                    INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                END''',
+                '''CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE ON products BEGIN
+                    INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                    INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name);
+                END''',
+            ):
+                cursor.execute(statement)
+            if not fts_exists:
+                # Index rows that were inserted before the full-text table existed
+                cursor.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+            
+            # Version counter bumped on every write, used to invalidate cached
+            # responses (in every worker process, since it lives in the database)
+            for statement in (
+                '''CREATE TABLE IF NOT EXISTS products_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )''',
+                'INSERT OR IGNORE INTO products_version (id, version) VALUES (1, 0)',
+                '''CREATE TRIGGER IF NOT EXISTS products_version_insert AFTER INSERT ON products BEGIN
+                    UPDATE products_version SET version = version + 1 WHERE id = 1;
+                END''',
+                '''CREATE TRIGGER IF NOT EXISTS products_version_update AFTER UPDATE ON products BEGIN
+                    UPDATE products_version SET version = version + 1 WHERE id = 1;
+                END''',
+                '''CREATE TRIGGER IF NOT EXISTS products_version_delete AFTER DELETE ON products BEGIN
+                    UPDATE products_version SET version = version + 1 WHERE id = 1;
+                END''',
+            ):
+                cursor.execute(statement)
+            
+            # Add some sample data if table is empty
+            cursor.execute(SQL_COUNT_PRODUCTS)
+            if cursor.fetchone()[0] == 0:
+                logger.info("Initializing database with sample data")
+                products = [
+                    ('Laptop', 999.99, 10),
+                    ('Smartphone', 499.99, 20),
+                    ('Headphones', 99.99, 30),
+                    ('Tablet', 299.99, 15),
+                    ('Monitor', 249.99, 5)
+                ]
+                cursor.executemany(SQL_INSERT_PRODUCT, products)
+            
             db.commit()
+        except Exception:
+            db.rollback()
+            raise
 
 # Database connection management
+# Idle connections are kept here and reused across requests
+db_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+def open_connection():
+    """Open a new database connection tuned for a read-heavy workload"""
+    db = sqlite3.connect(DATABASE, check_same_thread=False, isolation_level=None)
+    db.row_factory = sqlite3.Row  # Enable row factory for dict-like access
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+    db.execute('PRAGMA temp_store=MEMORY')
+    return db
+
 def get_db():
     """Get database connection for the current request"""
     db = getattr(g, '_database', None)
     if db is None:
-        db = g._database = sqlite3.connect(DATABASE)
-        db.row_factory = sqlite3.Row  # Enable row factory for dict-like access
+        try:
+            db = db_pool.get_nowait()
+        except queue.Empty:
+            db = open_connection()
+        g._database = db
     return db
 
 @app.teardown_appcontext
 def close_connection(exception):
-    """Close database connection when application context ends"""
-    db = getattr(g, '_database', None)
-    if db is not None:
+    """Return the database connection to the pool when application context ends"""
+    db = g.pop('_database', None)
+    if db is None:
+        return
+    if db.in_transaction:
+        db.rollback()
+    try:
+        db_pool.put_nowait(db)
+    except queue.Full:
         db.close()
 
 # Performance monitoring decorator
 def timing_decorator(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        if not logger.isEnabledFor(logging.INFO):
+            return f(*args, **kwargs)
+        start_time = time.perf_counter()
         result = f(*args, **kwargs)
-        end_time = time.time()
-        logger.info(f"Function {f.__name__} executed in {end_time - start_time:.4f} seconds")
+        end_time = time.perf_counter()
+        logger.info("Function %s executed in %.4f seconds", f.__name__, end_time - start_time)
         return result
     return wrapper
 
+def fetch_dicts(cursor, size):
+    """Fetch up to size rows as dicts, reading the column names only once"""
+    cursor.arraysize = size
+    rows = cursor.fetchmany()
+    if not rows:
+        return []
+    keys = rows[0].keys()
+    return [dict(zip(keys, row)) for row in rows]
+
+# Response caching
+def get_data_version():
+    """Get the current products version, which changes on every write"""
+    cursor = get_db().cursor()
+    cursor.execute(SQL_DATA_VERSION)
+    return cursor.fetchone()[0]
+
+def encode_cached(payload):
+    """Encode a JSON payload and compute its ETag"""
+    body = orjson.dumps(payload)
+    return body, hashlib.md5(body).hexdigest()
+
+def conditional_response(body, etag):
+    """JSON response with an ETag; a 304 when the client already has it"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 # Request validation functions
 def validate_product_data(data):
     """Validate product data from request"""
@@ -126,40 +287,71 @@ def get_products():
         page = int(request.args.get('page', 1))
         if page < 1:
             page = 1
-            
-        offset = (page - 1) * ROWS_PER_PAGE
         
-        db = get_db()
-        cursor = db.cursor()
-        
-        # Get total count for pagination info
-        cursor.execute('SELECT COUNT(*) FROM products')
-        total_count = cursor.fetchone()[0]
-        
-        # Get paginated results with proper parameter binding
-        cursor.execute(
-            'SELECT * FROM products ORDER BY id LIMIT ? OFFSET ?', 
-            (ROWS_PER_PAGE, offset)
-        )
-        
-        # Use dictionary cursor for efficient JSON conversion
-        products = [dict(zip(['id', 'name', 'price', 'stock', 'created_at'], row)) for row in cursor.fetchall()]
-        
-        # Return with pagination metadata
-        return jsonify({
-            'products': products,
-            'pagination': {
-                'page': page,
-                'per_page': ROWS_PER_PAGE,
-                'total_count': total_count,
-                'total_pages': (total_count + ROWS_PER_PAGE - 1) // ROWS_PER_PAGE
-            }
-        }), 200
+        body, etag = render_products_page(get_data_version(), page)
+        return conditional_response(body, etag)
         
     except Exception as e:
         logger.error(f"Error getting products: {str(e)}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
 
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def render_products_page(version, page):
+    """Encoded products page, cached until the data version changes"""
+    offset = (page - 1) * ROWS_PER_PAGE
+    
+    db = get_db()
+    cursor = db.cursor()
+    
+    # Get total count for pagination info
+    cursor.execute(SQL_COUNT_PRODUCTS)
+    total_count = cursor.fetchone()[0]
+    
+    # Get paginated results with proper parameter binding
+    cursor.execute(SQL_SELECT_PAGE, (ROWS_PER_PAGE, offset))
+    
+    products = fetch_dicts(cursor, ROWS_PER_PAGE)
+    
+    # Return with pagination metadata
+    return encode_cached({
+        'products': products,
+        'pagination': {
+            'page': page,
+            'per_page': ROWS_PER_PAGE,
+            'total_count': total_count,
+            'total_pages': (total_count + ROWS_PER_PAGE - 1) // ROWS_PER_PAGE
+        }
+    })
+
+@app.route('/products/export', methods=['GET'])
+def export_products():
+    """Stream every product as JSON without loading the whole table"""
+    # Not wrapped in timing_decorator: the view returns before any rows are
+    # read, so the timing is taken over the whole stream in generate()
+    start_time = time.perf_counter()
+    cursor = get_db().cursor()
+    cursor.execute(SQL_SELECT_ALL)
+    cursor.arraysize = EXPORT_CHUNK_SIZE
+    
+    def generate():
+        # Encode and send one chunk of rows at a time, so memory use stays
+        # flat and clients can start parsing before the last row is read
+        try:
+            yield b'{"products":['
+            separator = b''
+            rows = cursor.fetchmany()
+            keys = rows[0].keys() if rows else ()
+            while rows:
+                yield separator + b','.join(orjson.dumps(dict(zip(keys, row))) for row in rows)
+                separator = b','
+                rows = cursor.fetchmany()
+            yield b']}'
+        finally:
+            logger.info("Function %s executed in %.4f seconds",
+                        'export_products', time.perf_counter() - start_time)
+    
+    return app.response_class(stream_with_context(generate()), mimetype='application/json')
+
 @app.route('/product/<int:product_id>', methods=['GET'])
 @timing_decorator
 def get_product(product_id):
@@ -169,13 +361,12 @@ def get_product(product_id):
         cursor = db.cursor()
         
         # Use parameter binding to prevent SQL injection
-        cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
+        cursor.execute(SQL_SELECT_PRODUCT, (product_id,))
         product = cursor.fetchone()
         
         if product:
             # Convert to dictionary for JSON response
-            product_dict = dict(zip(['id', 'name', 'price', 'stock', 'created_at'], product))
-            return jsonify(product_dict), 200
+            return jsonify(dict(product)), 200
         else:
             logger.info(f"Product not found: {product_id}")
             return jsonify({'error': 'Product not found'}), 404
@@ -199,20 +390,12 @@ def add_product():
         db = get_db()
         cursor = db.cursor()
         
-        # Use proper parameter binding
-        cursor.execute(
-            'INSERT INTO products (name, price, stock) VALUES (?, ?, ?)',
-            (data['name'], data['price'], data['stock'])
-        )
+        # Use proper parameter binding; the new row comes back from the insert
+        cursor.execute(SQL_INSERT_PRODUCT_RETURNING, (data['name'], data['price'], data['stock']))
+        product_dict = dict(cursor.fetchone())
         db.commit()
-        new_id = cursor.lastrowid
         
-        # Fetch the new product to return
-        cursor.execute('SELECT * FROM products WHERE id = ?', (new_id,))
-        new_product = cursor.fetchone()
-        product_dict = dict(zip(['id', 'name', 'price', 'stock', 'created_at'], new_product))
-        
-        logger.info(f"Created new product: {new_id}")
+        logger.info(f"Created new product: {product_dict['id']}")
         return jsonify(product_dict), 201
         
     except Exception as e:
@@ -234,23 +417,20 @@ def update_product(product_id):
         db = get_db()
         cursor = db.cursor()
         
-        # Check if product exists
-        cursor.execute('SELECT id FROM products WHERE id = ?', (product_id,))
-        if not cursor.fetchone():
-            logger.info(f"Product not found for update: {product_id}")
-            return jsonify({'error': 'Product not found'}), 404
-        
-        # Update product with parameter binding
+        # Update product with parameter binding; no returned row means
+        # the product doesn't exist
         cursor.execute(
-            'UPDATE products SET name = ?, price = ?, stock = ? WHERE id = ?',
+            SQL_UPDATE_PRODUCT,
             (data['name'], data['price'], data['stock'], product_id)
         )
+        updated_product = cursor.fetchone()
         db.commit()
         
-        # Get updated product
-        cursor.execute('SELECT * FROM products WHERE id = ?', (product_id,))
-        updated_product = cursor.fetchone()
-        product_dict = dict(zip(['id', 'name', 'price', 'stock', 'created_at'], updated_product))
+        if not updated_product:
+            logger.info(f"Product not found for update: {product_id}")
+            return jsonify({'error': 'Product not found'}), 404
+        
+        product_dict = dict(updated_product)
         
         logger.info(f"Updated product: {product_id}")
         return jsonify(product_dict), 200
@@ -267,16 +447,15 @@ def delete_product(product_id):
         db = get_db()
         cursor = db.cursor()
         
-        # Check if product exists
-        cursor.execute('SELECT id FROM products WHERE id = ?', (product_id,))
-        if not cursor.fetchone():
+        # Delete product; no returned row means the product doesn't exist
+        cursor.execute(SQL_DELETE_PRODUCT, (product_id,))
+        deleted = cursor.fetchone()
+        db.commit()
+        
+        if not deleted:
             logger.info(f"Product not found for deletion: {product_id}")
             return jsonify({'error': 'Product not found'}), 404
         
-        # Delete product
-        cursor.execute('DELETE FROM products WHERE id = ?', (product_id,))
-        db.commit()
-        
         logger.info(f"Deleted product: {product_id}")
         return jsonify({'message': f'Product {product_id} deleted successfully'}), 200
         
@@ -287,34 +466,63 @@ def delete_product(product_id):
 @app.route('/search', methods=['GET'])
 @timing_decorator
 def search_products():
-    """Search products by name (optimized)"""
+    """Search products by name (optimized)
+
+    By default returns every name containing the query: names with a word
+    starting with the query come first, ranked by the full-text index,
+    followed by the remaining substring matches ("phone" in "Smartphone")
+    in name order. With mode=prefix, matches names starting with the query
+    instead.
+    """
     try:
         query = request.args.get('q', '')
+        mode = request.args.get('mode', 'words')
         
         if not query:
             return jsonify({'products': [], 'count': 0}), 200
         
-        db = get_db()
-        cursor = db.cursor()
-        
-        # Use SQL LIKE for efficient searching with parameter binding
-        search_param = f'%{query}%'
-        cursor.execute(
-            'SELECT * FROM products WHERE name LIKE ? ORDER BY name LIMIT 100',
-            (search_param,)
-        )
-        
-        products = [dict(zip(['id', 'name', 'price', 'stock', 'created_at'], row)) for row in cursor.fetchall()]
-        
-        return jsonify({
-            'products': products,
-            'count': len(products)
-        }), 200
+        body, etag = render_search_results(get_data_version(), query, mode == 'prefix')
+        return conditional_response(body, etag)
         
     except Exception as e:
         logger.error(f"Error searching products: {str(e)}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
 
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def render_search_results(version, query, prefix):
+    """Encoded search results, cached until the data version changes"""
+    db = get_db()
+    cursor = db.cursor()
+    
+    # Escape LIKE wildcards in the user input
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    if prefix:
+        # A LIKE pattern without a leading wildcard is an index range scan
+        cursor.execute(SQL_SEARCH_PRODUCTS_PREFIX, (escaped + '%',))
+        products = fetch_dicts(cursor, SEARCH_LIMIT)
+    else:
+        # Full-text prefix match; quoting the query as a phrase keeps FTS5
+        # operators in user input from being interpreted
+        search_param = '"' + query.replace('"', '""') + '"*'
+        cursor.execute(SQL_SEARCH_PRODUCTS, (search_param,))
+        products = fetch_dicts(cursor, SEARCH_LIMIT)
+        if len(products) < SEARCH_LIMIT:
+            # Then names containing the query inside a word, which the index
+            # can't find, so the results stay a superset of substring matches
+            cursor.execute(SQL_SEARCH_PRODUCTS_SUBSTRING, ('%' + escaped + '%',))
+            seen = {product['id'] for product in products}
+            for product in fetch_dicts(cursor, SEARCH_LIMIT):
+                if product['id'] not in seen:
+                    products.append(product)
+                    if len(products) == SEARCH_LIMIT:
+                        break
+    
+    return encode_cached({
+        'products': products,
+        'count': len(products)
+    })
+
 # Error handlers
 @app.errorhandler(HTTPException)
 def handle_http_exception(e):
@@ -345,6 +553,11 @@ def before_first_request():
     """Initialize the database before first request"""
     init_db()
 
+# The Werkzeug server below is for local development only. In production run
+# the app under gunicorn with threaded workers. sqlite3 is a C extension that
+# gevent cannot make cooperative, so a slow query would stall a whole gevent
+# worker; with gthread it only holds one thread:
+#   gunicorn -k gthread -w $(nproc) --threads 8 -b 0.0.0.0:5000 challenge_13:app
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port)
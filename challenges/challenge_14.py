@@ -3,27 +3,88 @@
 from typing import Dict, List, Tuple, Any, Optional
 import re
 import json
+import asyncio
 import random
 import time
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime
 
+import ahocorasick
+
+# Conversation history keeps the latest HISTORY_SIZE messages
+HISTORY_SIZE = 512
+USER, ASSISTANT = 0, 1
+
+# Number of distinct normalized queries whose keyword scores are memoized
+MATCH_CACHE_SIZE = 1024
+
+# Sentiment words and preference mentions, matched on the lowercased query
+WORD_RE = re.compile(r"\w+")
+POSITIVE_WORDS = frozenset({"happy", "great", "excellent", "good", "thanks"})
+NEGATIVE_WORDS = frozenset({"sad", "bad", "terrible", "awful", "sorry"})
+FAVORITE_RE = re.compile(r"favorite\s+(\w+)")
+
+# Templates for the dynamic "time" topic, filled in when the topic is answered
+TIME_RESPONSES = (
+    "The current time is {time} and today is {full_date}.",
+    "It's {time} on {full_date}.",
+    "Today is {date} and the time is {time}.",
+    "Right now it's {time} {am_pm} on {full_date}.",
+)
+
+# Replies used when no topic matches; "{query}" is filled with the user's query
+FALLBACK_RESPONSES = (
+    "I'm not sure I understand. Could you rephrase that?",
+    "I don't have specific information about that. Is there something else I can help with?",
+    "That's beyond my current capabilities. Would you like to discuss something else?",
+    "I don't have enough knowledge to respond to that properly. Can you try a different question?",
+    "I don't have a specific response for '{query}'. Would you like to know what topics I can discuss?",
+)
+
+@dataclass(slots=True)
+class Turn:
+    """A single message in the conversation history"""
+    role: int
+    message: str
+    timestamp: float
+    is_fallback: bool = False
+
 class EnhancedAgent:
     """
     An enhanced AI agent that handles multiple queries with different responses
     based on keyword matching, context awareness, and state management.
     """
+    __slots__ = (
+        "name", "personality", "knowledge_base", "conversation_history",
+        "message_count", "session_start", "state", "_response_cursor",
+        "_consecutive_fallbacks", "_lock", "_automaton", "_cached_scores",
+        "_topics", "_topic_ids", "_topics_joined", "_kw_topic_ids", "_kw_lens",
+    )
+    
     def __init__(self, name: str, personality: str = "helpful"):
         self.name = name
         self.personality = personality
         self.knowledge_base = {}
-        self.conversation_history = []
-        self.session_start = datetime.now()
+        self.conversation_history = deque(maxlen=HISTORY_SIZE)
+        self.message_count = 0
+        self.session_start = time.monotonic()
         self.state = {
             "mood": "neutral",
-            "topics_discussed": set(),
+            # Bitmask over topic ids (positions in self._topics)
+            "topics_discussed": 0,
             "user_preferences": {},
             "context": {}
         }
+        # Next response to use per topic and number of fallbacks in a row,
+        # kept up to date so history never has to be rescanned
+        self._response_cursor = defaultdict(int)
+        self._consecutive_fallbacks = 0
+        # Serializes turns taken through respond_async
+        self._lock = asyncio.Lock()
         
         # Load default responses
         self._load_default_responses()
@@ -73,12 +134,8 @@ class EnhancedAgent:
             },
             "time": {
                 "keywords": ["time", "date", "day", "today", "current time"],
-                "responses": [
-                    f"The current time is {datetime.now().strftime('%H:%M')} and today is {datetime.now().strftime('%A, %B %d, %Y')}.",
-                    f"It's {datetime.now().strftime('%H:%M')} on {datetime.now().strftime('%A, %B %d, %Y')}.",
-                    f"Today is {datetime.now().strftime('%A, %B %d')} and the time is {datetime.now().strftime('%H:%M')}.",
-                    f"Right now it's {datetime.now().strftime('%H:%M %p on %A, %B %d, %Y')}."
-                ],
+                # Rendered from TIME_RESPONSES on every query
+                "responses": [],
                 "context_required": False,
                 "dynamic": True
             },
@@ -103,12 +160,50 @@ class EnhancedAgent:
                 "context_required": False
             }
         }
+        self._build_automaton()
+    
+    def _build_automaton(self):
+        """
+        Index every keyword, and each word of the multi-word keywords, in a
+        single Aho–Corasick automaton so a query is scanned only once.
+        Keywords are numbered, with their topic id and length kept in flat
+        lists, so scoring a match is just list indexing. The topic listing
+        used in replies is joined here too, once per knowledge base change.
+        """
+        automaton = ahocorasick.Automaton()
+        self._topics = list(self.knowledge_base)
+        self._topic_ids = {topic: topic_id for topic_id, topic in enumerate(self._topics)}
+        self._topics_joined = ", ".join(self._topics)
+        self._kw_topic_ids = []
+        self._kw_lens = []
+        for topic_id, data in enumerate(self.knowledge_base.values()):
+            for keyword in data["keywords"]:
+                if not keyword:
+                    continue
+                keyword_id = len(self._kw_lens)
+                self._kw_topic_ids.append(topic_id)
+                self._kw_lens.append(len(keyword))
+                patterns = [(keyword, False)]
+                parts = keyword.split()
+                if len(keyword) > 3 and len(parts) > 1:
+                    patterns.extend((part, True) for part in parts)
+                for pattern, is_part in patterns:
+                    hits = automaton.get(pattern, [])
+                    hits.append((keyword_id, is_part))
+                    automaton.add_word(pattern, hits)
+        automaton.make_automaton()
+        self._automaton = automaton
+        # A fresh cache per build, so scores never outlive the keywords
+        self._cached_scores = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._score_query)
     
     def add_topic(self, topic: str, keywords: List[str], responses: List[str], context_required: bool = False, dynamic: bool = False):
         """Add a new topic to the agent's knowledge base"""
+        # Queries are lowercased before matching, so keywords must be too
+        keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
         if topic in self.knowledge_base:
             # Update existing topic
-            self.knowledge_base[topic]["keywords"].extend([k for k in keywords if k not in self.knowledge_base[topic]["keywords"]])
+            known_keywords = set(self.knowledge_base[topic]["keywords"])
+            self.knowledge_base[topic]["keywords"].extend([k for k in keywords if k not in known_keywords])
             self.knowledge_base[topic]["responses"].extend(responses)
         else:
             # Create new topic
@@ -118,12 +213,13 @@ class EnhancedAgent:
                 "context_required": context_required,
                 "dynamic": dynamic
             }
+        self._build_automaton()
         return f"Topic '{topic}' has been added to my knowledge base with {len(keywords)} keywords and {len(responses)} responses."
     
     def respond(self, query: str) -> str:
         """Process the query and generate an appropriate response"""
         # Record the query in conversation history
-        self.conversation_history.append({"role": "user", "message": query, "timestamp": datetime.now()})
+        self._record(USER, query)
         
         # Normalize the query
         normalized_query = query.lower().strip()
@@ -142,62 +238,97 @@ class EnhancedAgent:
         # Find matching topics based on keywords
         matched_topics = self._match_topics(normalized_query)
         
-        # Generate response
-        response = self._generate_response(matched_topics, normalized_query)
+        # Generate response; only the best two matches are ever looked at
+        response, topic = self._generate_response(nlargest(2, matched_topics, key=itemgetter(1)), normalized_query)
         
         # Update state
         self._update_state(normalized_query, matched_topics)
         
         # Record the response in conversation history
-        self.conversation_history.append({"role": "assistant", "message": response, "timestamp": datetime.now()})
+        is_fallback = topic is None
+        self._record(ASSISTANT, response, is_fallback)
+        if is_fallback:
+            self._consecutive_fallbacks += 1
+        else:
+            self._consecutive_fallbacks = 0
         
         return response
     
+    async def respond_async(self, query: str) -> str:
+        """
+        Async variant of respond() for agents served from an event loop.
+        Turns run one at a time, since they all update the same state, and
+        in a worker thread so other coroutines keep running meanwhile.
+        """
+        async with self._lock:
+            return await asyncio.to_thread(self.respond, query)
+    
+    def _record(self, role: int, message: str, is_fallback: bool = False):
+        """Append a message to the bounded conversation history"""
+        self.conversation_history.append(Turn(role, message, time.monotonic(), is_fallback))
+        self.message_count += 1
+    
     def _match_topics(self, query: str) -> List[Tuple[str, float]]:
         """
         Match the query against topics in the knowledge base and return
-        a list of matched topics with confidence scores.
+        a list of matched topics with confidence scores, in topic order.
         """
         matched_topics = []
-        
-        for topic, data in self.knowledge_base.items():
-            highest_confidence = 0
-            
-            # Check each keyword in the topic
-            for keyword in data["keywords"]:
-                # Direct match
-                if keyword in query:
-                    confidence = len(keyword) / len(query) * 0.8
-                    highest_confidence = max(highest_confidence, confidence)
-                
-                # Check for partial matches
-                elif len(keyword) > 3 and any(part in query for part in keyword.split()):
-                    confidence = 0.4
-                    highest_confidence = max(highest_confidence, confidence)
+        discussed = self.state["topics_discussed"]
+        for topic_id, confidence in self._cached_scores(query):
+            # Boost confidence for topics in the current context
+            if discussed >> topic_id & 1:
+                confidence += 0.1
             
-            # If we have a match with non-zero confidence
-            if highest_confidence > 0:
-                # Boost confidence for topics in the current context
-                if topic in self.state["topics_discussed"]:
-                    highest_confidence += 0.1
-                
-                matched_topics.append((topic, highest_confidence))
+            matched_topics.append((self._topics[topic_id], confidence))
+        
+        return matched_topics
+    
+    def _score_query(self, query: str) -> Tuple[Tuple[int, float], ...]:
+        """
+        Score the query against every topic's keywords, before any context
+        boost. Depends only on the query and the keywords, so it is memoized.
+        """
+        full_matches = set()
+        partial_matches = set()
+        for _, hits in self._automaton.iter(query):
+            for keyword_id, is_part in hits:
+                (partial_matches if is_part else full_matches).add(keyword_id)
+        
+        query_len = len(query)
+        kw_topic_ids = self._kw_topic_ids
+        kw_lens = self._kw_lens
+        best = [0.0] * len(self._topics)
+        # Direct match
+        for keyword_id in full_matches:
+            topic_id = kw_topic_ids[keyword_id]
+            confidence = kw_lens[keyword_id] / query_len * 0.8
+            if confidence > best[topic_id]:
+                best[topic_id] = confidence
         
-        # Sort by confidence score in descending order
-        return sorted(matched_topics, key=lambda x: x[1], reverse=True)
+        # Partial matches only count for keywords that were not matched directly
+        for keyword_id in partial_matches - full_matches:
+            topic_id = kw_topic_ids[keyword_id]
+            if best[topic_id] < 0.4:
+                best[topic_id] = 0.4
+        
+        return tuple((topic_id, confidence) for topic_id, confidence in enumerate(best) if confidence > 0)
     
-    def _generate_response(self, matched_topics: List[Tuple[str, float]], query: str) -> str:
-        """Generate a response based on matched topics and context"""
+    def _generate_response(self, matched_topics: List[Tuple[str, float]], query: str) -> Tuple[str, Optional[str]]:
+        """
+        Generate a response based on matched topics, best first, and context,
+        returned with the topic it answers (None for a fallback response).
+        """
         # If no topics matched
         if not matched_topics:
-            return self._fallback_response(query)
+            return self._fallback_response(query), None
         
         # Get the highest confidence topic
         top_topic, confidence = matched_topics[0]
         
         # If confidence is too low, use fallback
         if confidence < 0.3:
-            return self._fallback_response(query)
+            return self._fallback_response(query), None
         
         # Get responses for the top topic
         responses = self.knowledge_base[top_topic]["responses"]
@@ -205,94 +336,71 @@ class EnhancedAgent:
         # If the topic has dynamic responses, refresh them
         if self.knowledge_base[top_topic].get("dynamic", False):
             if top_topic == "time":
-                responses = [
-                    f"The current time is {datetime.now().strftime('%H:%M')} and today is {datetime.now().strftime('%A, %B %d, %Y')}.",
-                    f"It's {datetime.now().strftime('%H:%M')} on {datetime.now().strftime('%A, %B %d, %Y')}.",
-                    f"Today is {datetime.now().strftime('%A, %B %d')} and the time is {datetime.now().strftime('%H:%M')}.",
-                    f"Right now it's {datetime.now().strftime('%H:%M %p on %A, %B %d, %Y')}."
-                ]
-        
-        # Select a response, avoiding the last used response for this topic if possible
-        last_response = None
-        if self.conversation_history:
-            for entry in reversed(self.conversation_history):
-                if entry["role"] == "assistant" and top_topic in self.state["topics_discussed"]:
-                    last_response = entry["message"]
-                    break
+                responses = self._time_responses()
         
-        if len(responses) > 1 and last_response in responses:
-            filtered_responses = [r for r in responses if r != last_response]
-            response = random.choice(filtered_responses)
-        else:
-            response = random.choice(responses)
+        # Rotate through the topic's responses so the last one is never repeated
+        index = self._response_cursor[top_topic] % len(responses)
+        response = responses[index]
+        self._response_cursor[top_topic] = index + 1
         
         # Add context-awareness for more natural conversations
         if len(self.conversation_history) >= 4:  # We have some conversation history
             if top_topic == "greeting" and any(topic[0] == "greeting" for topic in matched_topics[1:]):
                 # This is a repeated greeting
-                return "We've already greeted each other. What can I help you with today?"
+                return "We've already greeted each other. What can I help you with today?", top_topic
         
-        return response
+        return response, top_topic
+    
+    def _time_responses(self) -> List[str]:
+        """Render the time responses from a single clock reading"""
+        time_str, date, year, am_pm = datetime.now().strftime("%H:%M|%A, %B %d|%Y|%p").split("|")
+        values = {"time": time_str, "date": date, "full_date": f"{date}, {year}", "am_pm": am_pm}
+        return [template.format(**values) for template in TIME_RESPONSES]
     
     def _fallback_response(self, query: str) -> str:
         """Generate a fallback response when no topics match"""
-        fallbacks = [
-            "I'm not sure I understand. Could you rephrase that?",
-            "I don't have specific information about that. Is there something else I can help with?",
-            "That's beyond my current capabilities. Would you like to discuss something else?",
-            "I don't have enough knowledge to respond to that properly. Can you try a different question?",
-            f"I don't have a specific response for '{query}'. Would you like to know what topics I can discuss?"
-        ]
-        
         # If this is the second consecutive fallback, offer topics
-        consecutive_fallbacks = 0
-        for entry in reversed(self.conversation_history):
-            if entry["role"] == "assistant" and any(fb in entry["message"] for fb in fallbacks):
-                consecutive_fallbacks += 1
-            else:
-                break
-        
-        if consecutive_fallbacks >= 1:
-            return f"I'm still not understanding. Here are topics I can discuss: {', '.join(self.knowledge_base.keys())}. Which would you like to talk about?"
+        if self._consecutive_fallbacks >= 1:
+            return f"I'm still not understanding. Here are topics I can discuss: {self._topics_joined}. Which would you like to talk about?"
         
-        return random.choice(fallbacks)
+        return random.choice(FALLBACK_RESPONSES).format(query=query)
     
     def _update_state(self, query: str, matched_topics: List[Tuple[str, float]]):
-        """Update the agent's state based on the current query and matched topics"""
+        """
+        Update the agent's state based on the current query and matched topics.
+        The query is the already normalized (lowercased) one from respond().
+        """
         # Update topics discussed
         for topic, confidence in matched_topics:
             if confidence > 0.3:
-                self.state["topics_discussed"].add(topic)
+                self.state["topics_discussed"] |= 1 << self._topic_ids[topic]
         
         # Update context based on query content
         # This is a simplified version - in a real system, you'd use NLP to extract entities
-        if "favorite" in query.lower():
-            parts = query.lower().split("favorite")
-            if len(parts) > 1:
-                preference_type = parts[1].strip().split()[0]
-                self.state["user_preferences"][f"favorite_{preference_type}"] = "mentioned"
+        favorite = FAVORITE_RE.search(query)
+        if favorite:
+            self.state["user_preferences"][f"favorite_{favorite.group(1)}"] = "mentioned"
         
         # Update mood based on query sentiment (simplified)
-        if any(word in query.lower() for word in ["happy", "great", "excellent", "good", "thanks"]):
+        words = WORD_RE.findall(query)
+        if not POSITIVE_WORDS.isdisjoint(words):
             self.state["mood"] = "positive"
-        elif any(word in query.lower() for word in ["sad", "bad", "terrible", "awful", "sorry"]):
+        elif not NEGATIVE_WORDS.isdisjoint(words):
             self.state["mood"] = "negative"
         else:
             self.state["mood"] = "neutral"
     
     def _list_topics(self) -> str:
         """Return a list of available topics"""
-        topics = list(self.knowledge_base.keys())
-        return f"I can discuss the following topics: {', '.join(topics)}. What would you like to talk about?"
+        return f"I can discuss the following topics: {self._topics_joined}. What would you like to talk about?"
     
     def _report_state(self) -> str:
         """Return a report of the agent's current state"""
-        topics = ", ".join(self.state["topics_discussed"]) if self.state["topics_discussed"] else "None yet"
+        discussed = self.state["topics_discussed"]
+        topics = ", ".join(topic for topic_id, topic in enumerate(self._topics) if discussed >> topic_id & 1) or "None yet"
         preferences = ", ".join(f"{k}: {v}" for k, v in self.state["user_preferences"].items()) if self.state["user_preferences"] else "None noted"
         
-        conversation_duration = datetime.now() - self.session_start
-        minutes = int(conversation_duration.total_seconds() / 60)
-        seconds = int(conversation_duration.total_seconds() % 60)
+        minutes, seconds = divmod(int(time.monotonic() - self.session_start), 60)
         
         return (
             f"Current State Report:\n"
@@ -302,19 +410,23 @@ class EnhancedAgent:
             f"- Topics discussed: {topics}\n"
             f"- User preferences: {preferences}\n"
             f"- Session duration: {minutes} minutes, {seconds} seconds\n"
-            f"- Conversation exchanges: {len(self.conversation_history) // 2}"
+            f"- Conversation exchanges: {self.message_count // 2}"
         )
     
     def reset_conversation(self):
         """Reset the conversation history and state while preserving knowledge"""
-        self.conversation_history = []
-        self.session_start = datetime.now()
+        self.conversation_history.clear()
+        self.message_count = 0
+        self.session_start = time.monotonic()
         self.state = {
             "mood": "neutral",
-            "topics_discussed": set(),
+            # Bitmask over topic ids (positions in self._topics)
+            "topics_discussed": 0,
             "user_preferences": {},
             "context": {}
         }
+        self._response_cursor.clear()
+        self._consecutive_fallbacks = 0
 
 # Demo function to test the agent
 def demo_enhanced_agent():
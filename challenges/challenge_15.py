@@ -1,35 +1,271 @@
 # Challenge 15: Advanced AI Agent with Multiple Data Sources
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import json
 import re
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional, Union, Tuple
-from datetime import datetime, timedelta
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 import random
 
+import ahocorasick
+
+# Upper bound on cached source results; the least recently used are evicted
+MAX_CACHE_ENTRIES = 1024
+
+# Conversation history keeps the latest HISTORY_SIZE messages
+HISTORY_SIZE = 256
+
+# Threads per agent for fetching the sources of a multi-source query
+MAX_FETCH_WORKERS = 4
+
+# (connect, read) timeouts in seconds for the external API requests
+REQUEST_TIMEOUT = (2.0, 5.0)
+
+# Keywords that select each intent in MultiSourceAgent._parse_query when
+# they appear in the query as whole words
+INTENT_KEYWORDS = {
+    "help": ("help", "assist", "support", "what can you do", "your capabilities"),
+    "weather": ("weather", "temperature", "forecast", "rain", "sunny", "snow", "climate"),
+    "news": ("news", "headlines", "current events", "latest articles"),
+    "stocks": ("stock", "stocks", "share price", "market", "ticker", "nyse", "nasdaq"),
+    "crypto": ("crypto", "cryptocurrency", "bitcoin", "ethereum", "coin", "token", "blockchain"),
+    "wikipedia": ("what is", "who is", "tell me about", "information on", "wikipedia", "define", "meaning of"),
+    "translation": ("translate", "translation", "convert", "say in"),
+    "multi": ("compare", "both", "combination", "together", "and also"),
+}
+
+_INTENT_AUTOMATON = ahocorasick.Automaton()
+for _intent, _keywords in INTENT_KEYWORDS.items():
+    for _keyword in _keywords:
+        _INTENT_AUTOMATON.add_word(_keyword, (_intent, len(_keyword)))
+_INTENT_AUTOMATON.make_automaton()
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+def detect_intents(query: str) -> set:
+    """Scan the query once and return every intent with a whole-word keyword hit"""
+    intents = set()
+    last = len(query) - 1
+    for end, (intent, length) in _INTENT_AUTOMATON.iter(query):
+        start = end - length + 1
+        if (start == 0 or not _is_word_char(query[start - 1])) and (end == last or not _is_word_char(query[end + 1])):
+            intents.add(intent)
+    return intents
+
+# Patterns that extract the details of a query once its intent is known
+_RE_LOCATION = re.compile(r'(?:in|at|for)\s+([a-zA-Z\s,]+)(?:\?)?$')
+# "... in/at/for <place>" at the end of the query, else "<place> weather"
+_RE_WEATHER_LOCATION = re.compile(
+    r'\A(?:.*?(?:in|at|for)\s+([a-zA-Z\s,]*[a-zA-Z,][a-zA-Z\s,]*)(?:\?)?$'
+    r'|.*?\b([a-zA-Z]+(?:\s+[a-zA-Z]+)*)\s+weather\b)',
+    re.DOTALL,
+)
+_RE_NEWS_TOPIC = re.compile(r'(?:about|on|regarding)\s+([a-zA-Z\s]+)(?:\?)?$')
+_RE_STOCK_SYMBOL = re.compile(r'\b([A-Z]{1,5})\b')
+_RE_STOCK_COMPANY = re.compile(r'(?:for|of)\s+([a-zA-Z\s]+)(?:\?)?$')
+_RE_CRYPTO_COIN = re.compile(r'\b(bitcoin|btc|ethereum|eth|dogecoin|doge|litecoin|ltc|cardano|ada|ripple|xrp)\b', re.IGNORECASE)
+_RE_WIKI_TOPIC = re.compile(r'(?:what is|who is|tell me about|information on|define|meaning of)\s+([a-zA-Z0-9\s]+)(?:\?)?$')
+# Quoted text is preferred anywhere in the query over unquoted text
+_RE_TRANSLATE = re.compile(
+    r'\A(?:.*?translate\s+"([^"]+)"|.*?translate\s+([^"]+))'
+    r'\s+(?:from\s+([a-zA-Z]+)\s+)?(?:to|into)\s+([a-zA-Z]+)',
+    re.DOTALL,
+)
+_RE_WEATHER_THEN_NEWS = re.compile(r'\b(weather|temperature).+\b(news|headlines)\b')
+_RE_NEWS_THEN_WEATHER = re.compile(r'\b(news|headlines).+\b(weather|temperature)\b')
+
+# Replies and simulated data used by MultiSourceAgent
+HELP_MESSAGE = (
+    "I'm a multi-source information agent that can help you with various types of data. Here's what I can do:\n\n"
+    "🌤️ Weather Information: Ask about weather in any location\n"
+    "📰 News Updates: Get the latest headlines, optionally filtered by topic\n"
+    "📈 Stock Market Data: Check current prices and changes for stocks\n"
+    "🪙 Cryptocurrency Information: Get prices and trends for major cryptocurrencies\n"
+    "📚 General Knowledge: Get information about various topics from Wikipedia\n"
+    "🌐 Translation: Translate text between different languages\n\n"
+    "You can ask me things like:\n"
+    "- \"What's the weather in Paris?\"\n"
+    "- \"Tell me the latest technology news\"\n"
+    "- \"What's the current price of AAPL stock?\"\n"
+    "- \"How much is Bitcoin worth right now?\"\n"
+    "- \"What is quantum computing?\"\n"
+    "- \"Translate 'hello' to Spanish\"\n\n"
+    "You can also ask for combinations like \"What's the weather in London and give me the latest news\""
+)
+
+WEATHER_CONDITIONS = ("sunny", "partly cloudy", "cloudy", "rainy", "stormy", "snowy", "windy", "foggy")
+
+GENERAL_HEADLINES = (
+    "Global Leaders Meet to Discuss Climate Change Solutions",
+    "New Technology Breakthrough Could Revolutionize Renewable Energy",
+    "Stock Markets Reach Record Highs Amid Economic Recovery",
+    "Scientists Discover Potential New Treatment for Common Disease",
+    "Major Sports Championship Results in Unexpected Upset",
+    "Tech Company Announces Revolutionary New Product Line",
+    "Study Shows Significant Changes in Consumer Behavior Post-Pandemic",
+    "International Space Mission Makes Historic Discovery"
+)
+
+TOPIC_HEADLINES = {
+    "technology": (
+        "New Quantum Computing Breakthrough Could Transform Data Processing",
+        "Tech Giant Unveils Next-Generation Smartphone with Revolutionary Features",
+        "Artificial Intelligence System Achieves Human-Level Performance in Complex Task",
+        "Major Cybersecurity Vulnerability Discovered in Popular Software",
+        "Virtual Reality Technology Shows Promise in Educational Applications"
+    ),
+    "business": (
+        "Global Markets Respond to Changes in Interest Rates",
+        "Major Merger Creates New Industry Leader in Financial Services",
+        "Startup Secures Record Funding Round for Innovative Business Model",
+        "Changes in Consumer Spending Patterns Impact Retail Industry",
+        "New Economic Policies Announced to Stimulate Growth"
+    ),
+    "health": (
+        "New Study Reveals Benefits of Mediterranean Diet for Heart Health",
+        "Breakthrough in Medical Research Could Lead to Treatment for Rare Disease",
+        "Health Authorities Update Guidelines for Preventive Care",
+        "Mental Health Awareness Campaign Launches Nationwide",
+        "New Fitness Trend Gains Popularity Among Health Enthusiasts"
+    ),
+    "science": (
+        "Astronomers Discover New Exoplanet with Potential for Habitability",
+        "Breakthrough in Particle Physics Challenges Existing Theories",
+        "Research Team Develops New Method for Carbon Capture",
+        "Fossil Discovery Provides Insight into Ancient Ecosystem",
+        "New Mathematical Model Helps Predict Complex Natural Phenomena"
+    )
+}
+
+# Base prices for the simulated coin data
+COIN_BASE_PRICES = {
+    "btc": 30000,
+    "eth": 2000,
+    "doge": 0.1,
+    "ltc": 100,
+    "ada": 0.5,
+    "xrp": 0.5
+}
+
+COIN_NAMES = {
+    "btc": "Bitcoin",
+    "eth": "Ethereum",
+    "doge": "Dogecoin",
+    "ltc": "Litecoin",
+    "ada": "Cardano",
+    "xrp": "Ripple"
+}
+
+# Coin names and tickers mapped to a standard identifier
+COIN_IDS = {
+    "bitcoin": "btc", "btc": "btc", 
+    "ethereum": "eth", "eth": "eth",
+    "dogecoin": "doge", "doge": "doge",
+    "litecoin": "ltc", "ltc": "ltc",
+    "cardano": "ada", "ada": "ada",
+    "ripple": "xrp", "xrp": "xrp"
+}
+
+WIKI_SUMMARIES = {
+    "python programming": "Python is a high-level, interpreted programming language known for its readability and simplicity. Created by Guido van Rossum and first released in 1991, Python emphasizes code readability with its notable use of significant whitespace. Its language constructs and object-oriented approach aim to help programmers write clear, logical code for small and large-scale projects. Python is dynamically typed and garbage-collected. It supports multiple programming paradigms, including structured, object-oriented, and functional programming.",
+    "artificial intelligence": "Artificial Intelligence (AI) refers to the simulation of human intelligence in machines that are programmed to think like humans and mimic their actions. The term may also be applied to any machine that exhibits traits associated with a human mind such as learning and problem-solving. The ideal characteristic of artificial intelligence is its ability to rationalize and take actions that have the best chance of achieving a specific goal. AI research has been defined as the field of study of intelligent agents, which refers to any system that perceives its environment and takes actions that maximize its chance of achieving its goals.",
+    "quantum computing": "Quantum computing is a type of computation that harnesses the collective properties of quantum states, such as superposition, interference, and entanglement, to perform calculations. The devices that perform quantum computations are known as quantum computers. Though current quantum computers are too small to outperform usual (classical) computers for practical applications, they are believed to be capable of solving certain computational problems, such as integer factorization, substantially faster than classical computers.",
+    "climate change": "Climate change refers to significant, long-term changes in the global climate. The global climate is the connected system of sun, earth and oceans, wind, rain and snow, forests, deserts and savannas, and everything people do. The climate of a place, say New York, can be described as its rainfall, changing temperatures during the year and so on. But the global climate is more than the climate in one location. Global warming is often used interchangeably with the term climate change, though the latter refers to both human- and naturally-produced warming and the effects it has on our planet."
+}
+
+# Simulated translations by text and target language
+TRANSLATIONS = {
+    "hello": {
+        "spanish": "Hola",
+        "french": "Bonjour",
+        "german": "Hallo",
+        "italian": "Ciao",
+        "portuguese": "Olá",
+        "japanese": "こんにちは",
+        "chinese": "你好",
+        "russian": "Привет"
+    },
+    "goodbye": {
+        "spanish": "Adiós",
+        "french": "Au revoir",
+        "german": "Auf Wiedersehen",
+        "italian": "Arrivederci",
+        "portuguese": "Adeus",
+        "japanese": "さようなら",
+        "chinese": "再见",
+        "russian": "До свидания"
+    },
+    "thank you": {
+        "spanish": "Gracias",
+        "french": "Merci",
+        "german": "Danke",
+        "italian": "Grazie",
+        "portuguese": "Obrigado",
+        "japanese": "ありがとう",
+        "chinese": "谢谢",
+        "russian": "Спасибо"
+    }
+}
+
+@dataclass(slots=True, frozen=True)
+class Turn:
+    """A single message in the conversation history"""
+    role: str
+    message: str
+    timestamp: float
+
 class MultiSourceAgent:
     """
     An advanced AI agent that can handle complex queries and respond with relevant information
     from multiple external data sources.
     """
+    __slots__ = (
+        "name", "api_keys", "cache", "cache_duration", "conversation_history",
+        "_rng", "_executor", "_cache_lock", "_session", "_last_analysis",
+    )
     
-    def __init__(self, name: str = "MultiAgent"):
+    def __init__(self, name: str = "MultiAgent", seed: Optional[int] = None):
         self.name = name
+        # Private generator for the simulated data; pass a seed to make it reproducible
+        self._rng = random.Random(seed)
+        # (normalized query, analysis) of the most recent query
+        self._last_analysis = None
         self.api_keys = {}
-        self.cache = {}
-        self.cache_expiry = {}
+        # cache_key -> (result, expiry as a time.monotonic() reading), in LRU order
+        self.cache = OrderedDict()
         self.cache_duration = 30 * 60  # 30 minutes default
-        self.conversation_history = []
-        self.sources = {
-            "weather": self._get_weather_data,
-            "news": self._get_news_data,
-            "stocks": self._get_stock_data,
-            "crypto": self._get_crypto_data,
-            "wikipedia": self._get_wikipedia_data,
-            "translation": self._translate_text
-        }
+        self.conversation_history = deque(maxlen=HISTORY_SIZE)
+        # Multi-source queries fetch their sources on this pool in parallel,
+        # so the cache is guarded by a lock
+        self._executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix=name)
+        self._cache_lock = threading.Lock()
+        # One keep-alive session for all API requests, so repeated calls to
+        # the same host reuse their TCP/TLS connection
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.1),
+        ))
+    
+    def close(self) -> None:
+        """Release the HTTP connection pool and the fetcher threads"""
+        self._session.close()
+        self._executor.shutdown(wait=False)
+    
+    def __enter__(self) -> "MultiSourceAgent":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
         
     def set_api_key(self, service: str, api_key: str) -> None:
         """Set API key for a specific service"""
@@ -41,6 +277,27 @@ class MultiSourceAgent:
         self.cache_duration = seconds
         print(f"Cache duration set to {seconds} seconds.")
     
+    def _cache_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for the key, or None if missing or expired"""
+        with self._cache_lock:
+            entry = self.cache.get(cache_key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[1]:
+                del self.cache[cache_key]
+                return None
+            self.cache.move_to_end(cache_key)
+            return entry[0]
+    
+    def _cache_put(self, cache_key: str, result: Dict[str, Any]) -> None:
+        """Cache a result for cache_duration seconds, evicting the LRU entry when full"""
+        with self._cache_lock:
+            if cache_key in self.cache:
+                self.cache.move_to_end(cache_key)
+            elif len(self.cache) >= MAX_CACHE_ENTRIES:
+                self.cache.popitem(last=False)
+            self.cache[cache_key] = (result, time.monotonic() + self.cache_duration)
+    
     def respond(self, query: str) -> str:
         """
         Main method to respond to user queries by analyzing the query,
@@ -48,8 +305,7 @@ class MultiSourceAgent:
         generating a comprehensive response.
         """
         # Log the query
-        query_time = datetime.now()
-        self.conversation_history.append({"role": "user", "message": query, "timestamp": query_time})
+        self.conversation_history.append(Turn("user", query, time.monotonic()))
         
         # Process the query
         query_analysis = self._analyze_query(query)
@@ -63,46 +319,40 @@ class MultiSourceAgent:
             response = "I'm not sure how to process your query. Try asking about weather, news, stocks, cryptocurrency, or information from Wikipedia."
         
         # Log the response
-        self.conversation_history.append({"role": "assistant", "message": response, "timestamp": datetime.now()})
+        self.conversation_history.append(Turn("assistant", response, time.monotonic()))
         
         return response
     
     def _get_help_message(self) -> str:
         """Generate a help message explaining the agent's capabilities"""
-        return (
-            "I'm a multi-source information agent that can help you with various types of data. Here's what I can do:\n\n"
-            "🌤️ Weather Information: Ask about weather in any location\n"
-            "📰 News Updates: Get the latest headlines, optionally filtered by topic\n"
-            "📈 Stock Market Data: Check current prices and changes for stocks\n"
-            "🪙 Cryptocurrency Information: Get prices and trends for major cryptocurrencies\n"
-            "📚 General Knowledge: Get information about various topics from Wikipedia\n"
-            "🌐 Translation: Translate text between different languages\n\n"
-            "You can ask me things like:\n"
-            "- \"What's the weather in Paris?\"\n"
-            "- \"Tell me the latest technology news\"\n"
-            "- \"What's the current price of AAPL stock?\"\n"
-            "- \"How much is Bitcoin worth right now?\"\n"
-            "- \"What is quantum computing?\"\n"
-            "- \"Translate 'hello' to Spanish\"\n\n"
-            "You can also ask for combinations like \"What's the weather in London and give me the latest news\""
-        )
+        return HELP_MESSAGE
     
     def _analyze_query(self, query: str) -> Dict[str, Any]:
         """Analyze the query to determine its type and relevant data sources"""
-        query = query.lower().strip()
+        # Strip first so lower() copies only the meaningful part
+        query = query.strip().lower()
+        
+        # Clients that retry resend the same query; reuse the last analysis
+        last = self._last_analysis
+        if last is not None and last[0] == query:
+            return last[1]
+        
+        analysis = self._parse_query(query)
+        self._last_analysis = (query, analysis)
+        return analysis
+    
+    def _parse_query(self, query: str) -> Dict[str, Any]:
+        """Work out the intent and its parameters from a normalized query"""
+        intents = detect_intents(query)
         
         # Check for help queries
-        if re.search(r'\b(help|assist|support|what can you do|your capabilities)\b', query):
+        if "help" in intents:
             return {"type": "help"}
         
         # Check for weather queries
-        if re.search(r'\b(weather|temperature|forecast|rain|sunny|snow|climate)\b', query):
-            location_match = re.search(r'(?:in|at|for)\s+([a-zA-Z\s,]+)(?:\?)?$', query)
-            location = location_match.group(1).strip() if location_match else None
-            
-            if not location:
-                location_match = re.search(r'\b([a-zA-Z]+(?:\s+[a-zA-Z]+)*)\s+weather\b', query)
-                location = location_match.group(1).strip() if location_match else None
+        if "weather" in intents:
+            location_match = _RE_WEATHER_LOCATION.match(query)
+            location = (location_match.group(1) or location_match.group(2)).strip() if location_match else None
             
             if not location:
                 return {"type": "error", "message": "I couldn't determine which location you want weather information for. Please specify a city or location."}
@@ -114,8 +364,8 @@ class MultiSourceAgent:
             }
         
         # Check for news queries
-        if re.search(r'\b(news|headlines|current events|latest articles)\b', query):
-            topic_match = re.search(r'(?:about|on|regarding)\s+([a-zA-Z\s]+)(?:\?)?$', query)
+        if "news" in intents:
+            topic_match = _RE_NEWS_TOPIC.search(query)
             topic = topic_match.group(1).strip() if topic_match else None
             
             return {
@@ -125,12 +375,12 @@ class MultiSourceAgent:
             }
         
         # Check for stock market queries
-        if re.search(r'\b(stock|stocks|share price|market|ticker|nyse|nasdaq)\b', query):
-            symbol_match = re.search(r'\b([A-Z]{1,5})\b', query)
+        if "stocks" in intents:
+            symbol_match = _RE_STOCK_SYMBOL.search(query)
             symbol = symbol_match.group(1) if symbol_match else None
             
             if not symbol:
-                company_match = re.search(r'(?:for|of)\s+([a-zA-Z\s]+)(?:\?)?$', query)
+                company_match = _RE_STOCK_COMPANY.search(query)
                 company = company_match.group(1).strip() if company_match else None
                 
                 if company:
@@ -147,32 +397,22 @@ class MultiSourceAgent:
             }
         
         # Check for cryptocurrency queries
-        if re.search(r'\b(crypto|cryptocurrency|bitcoin|ethereum|coin|token|blockchain)\b', query):
-            coin_match = re.search(r'\b(bitcoin|btc|ethereum|eth|dogecoin|doge|litecoin|ltc|cardano|ada|ripple|xrp)\b', query, re.IGNORECASE)
+        if "crypto" in intents:
+            coin_match = _RE_CRYPTO_COIN.search(query)
             coin = coin_match.group(1).lower() if coin_match else None
             
             if not coin:
                 return {"type": "error", "message": "I couldn't determine which cryptocurrency you're interested in. Please specify one like Bitcoin or Ethereum."}
             
-            # Standardize coin identifiers
-            coin_map = {
-                "bitcoin": "btc", "btc": "btc", 
-                "ethereum": "eth", "eth": "eth",
-                "dogecoin": "doge", "doge": "doge",
-                "litecoin": "ltc", "ltc": "ltc",
-                "cardano": "ada", "ada": "ada",
-                "ripple": "xrp", "xrp": "xrp"
-            }
-            
             return {
                 "type": "data",
                 "sources": ["crypto"],
-                "params": {"coin": coin_map.get(coin, coin)}
+                "params": {"coin": COIN_IDS.get(coin, coin)}
             }
         
         # Check for Wikipedia/information queries
-        if re.search(r'\b(what is|who is|tell me about|information on|wikipedia|define|meaning of)\b', query):
-            topic_match = re.search(r'(?:what is|who is|tell me about|information on|define|meaning of)\s+([a-zA-Z0-9\s]+)(?:\?)?$', query)
+        if "wikipedia" in intents:
+            topic_match = _RE_WIKI_TOPIC.search(query)
             topic = topic_match.group(1).strip() if topic_match else None
             
             if not topic:
@@ -185,15 +425,12 @@ class MultiSourceAgent:
             }
         
         # Check for translation queries
-        if re.search(r'\b(translate|translation|convert|say in)\b', query):
-            text_match = re.search(r'translate\s+"([^"]+)"\s+(?:from\s+([a-zA-Z]+)\s+)?(?:to|into)\s+([a-zA-Z]+)', query)
-            if not text_match:
-                text_match = re.search(r'translate\s+([^"]+)\s+(?:from\s+([a-zA-Z]+)\s+)?(?:to|into)\s+([a-zA-Z]+)', query)
-            
+        if "translation" in intents:
+            text_match = _RE_TRANSLATE.match(query)
             if text_match:
-                text = text_match.group(1).strip()
-                source_lang = text_match.group(2) if text_match.group(2) else "auto"
-                target_lang = text_match.group(3)
+                text = (text_match.group(1) or text_match.group(2)).strip()
+                source_lang = text_match.group(3) if text_match.group(3) else "auto"
+                target_lang = text_match.group(4)
                 
                 return {
                     "type": "data",
@@ -208,9 +445,9 @@ class MultiSourceAgent:
                 return {"type": "error", "message": "I couldn't understand your translation request. Please use a format like 'translate \"hello\" to Spanish'."}
         
         # Multi-source queries (complex)
-        if re.search(r'\b(compare|both|combination|together|and also)\b', query):
-            if re.search(r'\b(weather|temperature).+\b(news|headlines)\b', query) or re.search(r'\b(news|headlines).+\b(weather|temperature)\b', query):
-                location_match = re.search(r'(?:in|at|for)\s+([a-zA-Z\s,]+)(?:\?)?$', query)
+        if "multi" in intents:
+            if _RE_WEATHER_THEN_NEWS.search(query) or _RE_NEWS_THEN_WEATHER.search(query):
+                location_match = _RE_LOCATION.search(query)
                 location = location_match.group(1).strip() if location_match else "New York"
                 
                 return {
@@ -227,32 +464,32 @@ class MultiSourceAgent:
         sources = query_analysis["sources"]
         params = query_analysis.get("params", {})
         
-        results = {}
-        for source in sources:
-            if source in self.sources:
-                results[source] = self.sources[source](params)
-        
-        # Combine results into a coherent response
-        if len(results) == 1:
+        if len(sources) == 1:
             # Single source response
             source = sources[0]
-            if "error" in results[source]:
-                return f"Sorry, I couldn't retrieve {source} information: {results[source]['error']}"
+            data = self._fetch_source(source, params)
+            if data is not None and "error" in data:
+                return f"Sorry, I couldn't retrieve {source} information: {data['error']}"
             
-            if source == "weather":
-                return self._format_weather_response(results[source])
-            elif source == "news":
-                return self._format_news_response(results[source])
-            elif source == "stocks":
-                return self._format_stock_response(results[source])
-            elif source == "crypto":
-                return self._format_crypto_response(results[source])
-            elif source == "wikipedia":
-                return self._format_wikipedia_response(results[source])
-            elif source == "translation":
-                return self._format_translation_response(results[source])
+            match source:
+                case "weather":
+                    return self._format_weather_response(data)
+                case "news":
+                    return self._format_news_response(data)
+                case "stocks":
+                    return self._format_stock_response(data)
+                case "crypto":
+                    return self._format_crypto_response(data)
+                case "wikipedia":
+                    return self._format_wikipedia_response(data)
+                case "translation":
+                    return self._format_translation_response(data)
         else:
-            # Multi-source response
+            # Multi-source response; overlap the request latencies instead of
+            # paying them one after another
+            futures = {source: self._executor.submit(self._fetch_source, source, params) for source in sources}
+            results = {source: future.result() for source, future in futures.items()}
+            
             response_parts = []
             
             if "weather" in results and "news" in results:
@@ -271,6 +508,23 @@ class MultiSourceAgent:
         
         return "I couldn't process your request properly. Please try a different question."
     
+    def _fetch_source(self, source: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch the data for one source, or None if the source is unknown"""
+        match source:
+            case "weather":
+                return self._get_weather_data(params)
+            case "news":
+                return self._get_news_data(params)
+            case "stocks":
+                return self._get_stock_data(params)
+            case "crypto":
+                return self._get_crypto_data(params)
+            case "wikipedia":
+                return self._get_wikipedia_data(params)
+            case "translation":
+                return self._translate_text(params)
+        return None
+    
     def _get_weather_data(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Fetch weather data from OpenWeatherMap API or cache"""
         location = params.get("location")
@@ -280,40 +534,41 @@ class MultiSourceAgent:
         cache_key = f"weather_{location}"
         
         # Check cache first
-        if cache_key in self.cache and datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-            return self.cache[cache_key]
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # In a real implementation, you would use an actual API key and request
         # This is a simulated implementation
         api_key = self.api_keys.get("openweathermap")
         if not api_key:
             # Simulate weather data for demonstration
-            weather_conditions = ["sunny", "partly cloudy", "cloudy", "rainy", "stormy", "snowy", "windy", "foggy"]
-            temperature = round(random.uniform(0, 35), 1)  # Random temperature between 0 and 35°C
-            humidity = random.randint(30, 95)
-            wind_speed = round(random.uniform(0, 30), 1)
+            temperature = round(self._rng.uniform(0, 35), 1)  # Random temperature between 0 and 35°C
+            humidity = self._rng.randint(30, 95)
+            wind_speed = round(self._rng.uniform(0, 30), 1)
             
             result = {
                 "location": location,
                 "country": "Simulated Country",
                 "temperature": temperature,
-                "feels_like": temperature + random.uniform(-3, 3),
-                "conditions": random.choice(weather_conditions),
+                "feels_like": temperature + self._rng.uniform(-3, 3),
+                "conditions": self._rng.choice(WEATHER_CONDITIONS),
                 "humidity": humidity,
                 "wind_speed": wind_speed,
-                "timestamp": datetime.now().timestamp(),
+                "timestamp": time.time(),
                 "simulated": True
             }
             
             # Cache the result
-            self.cache[cache_key] = result
-            self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+            self._cache_put(cache_key, result)
             
             return result
         
         # With a real API key, you would make an actual API request
         # For example:
         """
+        import orjson  # faster JSON parsing than response.json()
+        
         try:
             base_url = "https://api.openweathermap.org/data/2.5/weather"
             params = {
@@ -321,9 +576,9 @@ class MultiSourceAgent:
                 "appid": api_key,
                 "units": "metric"
             }
-            response = requests.get(base_url, params=params)
+            response = self._session.get(base_url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             result = {
                 "location": data["name"],
@@ -337,8 +592,7 @@ class MultiSourceAgent:
             }
             
             # Cache the result
-            self.cache[cache_key] = result
-            self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+            self._cache_put(cache_key, result)
             
             return result
         except Exception as e:
@@ -353,67 +607,24 @@ class MultiSourceAgent:
         cache_key = f"news_{topic}" if topic else "news_general"
         
         # Check cache first
-        if cache_key in self.cache and datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-            return self.cache[cache_key]
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Simulate news data for demonstration
-        general_headlines = [
-            "Global Leaders Meet to Discuss Climate Change Solutions",
-            "New Technology Breakthrough Could Revolutionize Renewable Energy",
-            "Stock Markets Reach Record Highs Amid Economic Recovery",
-            "Scientists Discover Potential New Treatment for Common Disease",
-            "Major Sports Championship Results in Unexpected Upset",
-            "Tech Company Announces Revolutionary New Product Line",
-            "Study Shows Significant Changes in Consumer Behavior Post-Pandemic",
-            "International Space Mission Makes Historic Discovery"
-        ]
-        
-        topic_headlines = {
-            "technology": [
-                "New Quantum Computing Breakthrough Could Transform Data Processing",
-                "Tech Giant Unveils Next-Generation Smartphone with Revolutionary Features",
-                "Artificial Intelligence System Achieves Human-Level Performance in Complex Task",
-                "Major Cybersecurity Vulnerability Discovered in Popular Software",
-                "Virtual Reality Technology Shows Promise in Educational Applications"
-            ],
-            "business": [
-                "Global Markets Respond to Changes in Interest Rates",
-                "Major Merger Creates New Industry Leader in Financial Services",
-                "Startup Secures Record Funding Round for Innovative Business Model",
-                "Changes in Consumer Spending Patterns Impact Retail Industry",
-                "New Economic Policies Announced to Stimulate Growth"
-            ],
-            "health": [
-                "New Study Reveals Benefits of Mediterranean Diet for Heart Health",
-                "Breakthrough in Medical Research Could Lead to Treatment for Rare Disease",
-                "Health Authorities Update Guidelines for Preventive Care",
-                "Mental Health Awareness Campaign Launches Nationwide",
-                "New Fitness Trend Gains Popularity Among Health Enthusiasts"
-            ],
-            "science": [
-                "Astronomers Discover New Exoplanet with Potential for Habitability",
-                "Breakthrough in Particle Physics Challenges Existing Theories",
-                "Research Team Develops New Method for Carbon Capture",
-                "Fossil Discovery Provides Insight into Ancient Ecosystem",
-                "New Mathematical Model Helps Predict Complex Natural Phenomena"
-            ]
-        }
-        
-        if topic and topic.lower() in topic_headlines:
-            headlines = random.sample(topic_headlines[topic.lower()], min(3, len(topic_headlines[topic.lower()])))
-        else:
-            headlines = random.sample(general_headlines, min(3, len(general_headlines)))
+        pool = TOPIC_HEADLINES.get(topic.lower(), GENERAL_HEADLINES) if topic else GENERAL_HEADLINES
+        # Pools of three or fewer headlines are returned whole, without a draw
+        headlines = self._rng.sample(pool, 3) if len(pool) > 3 else list(pool)
         
         result = {
             "headlines": headlines,
             "topic": topic if topic else "general",
-            "timestamp": datetime.now().timestamp(),
+            "timestamp": time.time(),
             "simulated": True
         }
         
         # Cache the result
-        self.cache[cache_key] = result
-        self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+        self._cache_put(cache_key, result)
         
         return result
     
@@ -426,12 +637,13 @@ class MultiSourceAgent:
         cache_key = f"stock_{symbol}"
         
         # Check cache first
-        if cache_key in self.cache and datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-            return self.cache[cache_key]
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Simulate stock data for demonstration
-        base_price = random.uniform(50, 500)
-        change_percentage = random.uniform(-5, 5)
+        base_price = self._rng.uniform(50, 500)
+        change_percentage = self._rng.uniform(-5, 5)
         
         result = {
             "symbol": symbol,
@@ -439,15 +651,14 @@ class MultiSourceAgent:
             "price": round(base_price, 2),
             "change": round(base_price * change_percentage / 100, 2),
             "change_percent": round(change_percentage, 2),
-            "volume": random.randint(100000, 10000000),
-            "market_cap": round(base_price * random.randint(1000000, 1000000000), 2),
-            "timestamp": datetime.now().timestamp(),
+            "volume": self._rng.randint(100000, 10000000),
+            "market_cap": round(base_price * self._rng.randint(1000000, 1000000000), 2),
+            "timestamp": time.time(),
             "simulated": True
         }
         
         # Cache the result
-        self.cache[cache_key] = result
-        self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+        self._cache_put(cache_key, result)
         
         return result
     
@@ -460,46 +671,29 @@ class MultiSourceAgent:
         cache_key = f"crypto_{coin}"
         
         # Check cache first
-        if cache_key in self.cache and datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-            return self.cache[cache_key]
-        
-        # Base prices for simulation
-        base_prices = {
-            "btc": 30000,
-            "eth": 2000,
-            "doge": 0.1,
-            "ltc": 100,
-            "ada": 0.5,
-            "xrp": 0.5
-        }
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        base_price = base_prices.get(coin.lower(), random.uniform(0.1, 100))
-        change_percentage = random.uniform(-10, 10)
+        base_price = COIN_BASE_PRICES.get(coin.lower())
+        if base_price is None:
+            base_price = self._rng.uniform(0.1, 100)
+        change_percentage = self._rng.uniform(-10, 10)
         
         # Simulate crypto data
-        coin_names = {
-            "btc": "Bitcoin",
-            "eth": "Ethereum",
-            "doge": "Dogecoin",
-            "ltc": "Litecoin",
-            "ada": "Cardano",
-            "xrp": "Ripple"
-        }
-        
         result = {
             "symbol": coin.upper(),
-            "name": coin_names.get(coin.lower(), f"{coin.upper()} Coin"),
+            "name": COIN_NAMES.get(coin.lower(), f"{coin.upper()} Coin"),
             "price_usd": round(base_price, 2),
             "change_24h": round(change_percentage, 2),
-            "market_cap": round(base_price * random.randint(1000000, 100000000), 2),
-            "volume_24h": round(base_price * random.randint(100000, 10000000), 2),
-            "timestamp": datetime.now().timestamp(),
+            "market_cap": round(base_price * self._rng.randint(1000000, 100000000), 2),
+            "volume_24h": round(base_price * self._rng.randint(100000, 10000000), 2),
+            "timestamp": time.time(),
             "simulated": True
         }
         
         # Cache the result
-        self.cache[cache_key] = result
-        self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+        self._cache_put(cache_key, result)
         
         return result
     
@@ -512,20 +706,14 @@ class MultiSourceAgent:
         cache_key = f"wiki_{topic}"
         
         # Check cache first
-        if cache_key in self.cache and datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-            return self.cache[cache_key]
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Simulate Wikipedia data
-        simulated_summaries = {
-            "python programming": "Python is a high-level, interpreted programming language known for its readability and simplicity. Created by Guido van Rossum and first released in 1991, Python emphasizes code readability with its notable use of significant whitespace. Its language constructs and object-oriented approach aim to help programmers write clear, logical code for small and large-scale projects. Python is dynamically typed and garbage-collected. It supports multiple programming paradigms, including structured, object-oriented, and functional programming.",
-            "artificial intelligence": "Artificial Intelligence (AI) refers to the simulation of human intelligence in machines that are programmed to think like humans and mimic their actions. The term may also be applied to any machine that exhibits traits associated with a human mind such as learning and problem-solving. The ideal characteristic of artificial intelligence is its ability to rationalize and take actions that have the best chance of achieving a specific goal. AI research has been defined as the field of study of intelligent agents, which refers to any system that perceives its environment and takes actions that maximize its chance of achieving its goals.",
-            "quantum computing": "Quantum computing is a type of computation that harnesses the collective properties of quantum states, such as superposition, interference, and entanglement, to perform calculations. The devices that perform quantum computations are known as quantum computers. Though current quantum computers are too small to outperform usual (classical) computers for practical applications, they are believed to be capable of solving certain computational problems, such as integer factorization, substantially faster than classical computers.",
-            "climate change": "Climate change refers to significant, long-term changes in the global climate. The global climate is the connected system of sun, earth and oceans, wind, rain and snow, forests, deserts and savannas, and everything people do. The climate of a place, say New York, can be described as its rainfall, changing temperatures during the year and so on. But the global climate is more than the climate in one location. Global warming is often used interchangeably with the term climate change, though the latter refers to both human- and naturally-produced warming and the effects it has on our planet."
-        }
-        
         # Generate a simulated response based on the topic or a generic one
-        if topic.lower() in simulated_summaries:
-            summary = simulated_summaries[topic.lower()]
+        if topic.lower() in WIKI_SUMMARIES:
+            summary = WIKI_SUMMARIES[topic.lower()]
         else:
             summary = f"{topic} is a topic of significance in its field. While detailed information would typically be available from Wikipedia, this is a simulated response providing general information about the concept. In a complete implementation, this would include a comprehensive summary from a knowledge source like Wikipedia."
         
@@ -533,13 +721,12 @@ class MultiSourceAgent:
             "topic": topic,
             "summary": summary,
             "url": f"https://en.wikipedia.org/wiki/{topic.replace(' ', '_')}",
-            "timestamp": datetime.now().timestamp(),
+            "timestamp": time.time(),
             "simulated": True
         }
         
         # Cache the result
-        self.cache[cache_key] = result
-        self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+        self._cache_put(cache_key, result)
         
         return result
     
@@ -558,47 +745,14 @@ class MultiSourceAgent:
         cache_key = f"translate_{source_lang}_{target_lang}_{text}"
         
         # Check cache first
-        if cache_key in self.cache and datetime.now() < self.cache_expiry.get(cache_key, datetime.min):
-            return self.cache[cache_key]
-        
-        # Simulate translations
-        simulated_translations = {
-            "hello": {
-                "spanish": "Hola",
-                "french": "Bonjour",
-                "german": "Hallo",
-                "italian": "Ciao",
-                "portuguese": "Olá",
-                "japanese": "こんにちは",
-                "chinese": "你好",
-                "russian": "Привет"
-            },
-            "goodbye": {
-                "spanish": "Adiós",
-                "french": "Au revoir",
-                "german": "Auf Wiedersehen",
-                "italian": "Arrivederci",
-                "portuguese": "Adeus",
-                "japanese": "さようなら",
-                "chinese": "再见",
-                "russian": "До свидания"
-            },
-            "thank you": {
-                "spanish": "Gracias",
-                "french": "Merci",
-                "german": "Danke",
-                "italian": "Grazie",
-                "portuguese": "Obrigado",
-                "japanese": "ありがとう",
-                "chinese": "谢谢",
-                "russian": "Спасибо"
-            }
-        }
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         # Try to find a simulated translation
         text_lower = text.lower()
-        if text_lower in simulated_translations and target_lang.lower() in simulated_translations[text_lower]:
-            translated_text = simulated_translations[text_lower][target_lang.lower()]
+        if text_lower in TRANSLATIONS and target_lang.lower() in TRANSLATIONS[text_lower]:
+            translated_text = TRANSLATIONS[text_lower][target_lang.lower()]
         else:
             # For other text, just append the target language to simulate translation
             translated_text = f"{text} [{target_lang} translation]"
@@ -608,13 +762,12 @@ class MultiSourceAgent:
             "translated_text": translated_text,
             "source_language": source_lang,
             "target_language": target_lang,
-            "timestamp": datetime.now().timestamp(),
+            "timestamp": time.time(),
             "simulated": True
         }
         
         # Cache the result
-        self.cache[cache_key] = result
-        self.cache_expiry[cache_key] = datetime.now() + timedelta(seconds=self.cache_duration)
+        self._cache_put(cache_key, result)
         
         return result
     
@@ -756,6 +909,7 @@ def demo_multi_source_agent():
         print("=" * 60)
         time.sleep(1)  # Pause between queries for readability
     
+    agent.close()
     print("\nDemo completed!")
 
 
@@ -1,40 +1,38 @@
-import threading
+import asyncio
 import time
-import urllib.request
 import os
+import aiohttp
+import aiofiles
 
-class DownloadThread(threading.Thread):
-    def __init__(self, url, filename):
-        super().__init__()
-        self.url = url
-        self.filename = filename
-        
-    def run(self):
-        print(f"Starting download of {self.url}")
-        start_time = time.time()
-        try:
-            urllib.request.urlretrieve(self.url, self.filename)
-            duration = time.time() - start_time
-            print(f"Downloaded {self.filename} in {duration:.2f} seconds")
-        except Exception as e:
-            print(f"Error downloading {self.url}: {e}")
+CHUNK_SIZE = 64 * 1024
 
-def download_files_concurrently(url_list):
-    threads = []
-    
+async def fetch_to_file(session, url, filename):
+    print(f"Starting download of {url}")
+    start_time = time.time()
+    try:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            # Stream the body to disk chunk by chunk instead of buffering it
+            async with aiofiles.open(filename, "wb") as f:
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    await f.write(chunk)
+        duration = time.time() - start_time
+        print(f"Downloaded {filename} in {duration:.2f} seconds")
+    except Exception as e:
+        print(f"Error downloading {url}: {e}")
+
+async def download_files_concurrently(url_list):
     # Create directory for downloads if it doesn't exist
     os.makedirs("downloads", exist_ok=True)
     
-    # Create and start a thread for each URL
-    for i, url in enumerate(url_list):
-        filename = f"downloads/file_{i+1}.txt"
-        thread = DownloadThread(url, filename)
-        threads.append(thread)
-        thread.start()
-    
-    # Wait for all threads to complete
-    for thread in threads:
-        thread.join()
+    # One session (and connection pool) shared by every download
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=8)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [
+            fetch_to_file(session, url, f"downloads/file_{i+1}.txt")
+            for i, url in enumerate(url_list)
+        ]
+        await asyncio.gather(*tasks)
     
     print("All downloads completed!")
 
@@ -48,4 +46,4 @@ if __name__ == "__main__":
         "https://www.gutenberg.org/files/11/11-0.txt"       # Alice's Adventures in Wonderland
     ]
     
-    download_files_concurrently(urls)
\ No newline at end of file
+    asyncio.run(download_files_concurrently(urls))
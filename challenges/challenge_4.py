@@ -1,34 +1,118 @@
 import multiprocessing
+from multiprocessing import shared_memory
 import time
-import math
+import numpy as np
+from numba import njit, prange
+
+def sum_of_squares_contiguous(start, stop):
+    # Closed form for start**2 + ... + stop**2 with 0 <= start, inclusive stop
+    if stop < start:
+        return 0
+    n, m = stop, start - 1
+    return n * (n + 1) * (2 * n + 1) // 6 - m * (m + 1) * (2 * m + 1) // 6
+
+# Largest magnitude whose square still fits in int64
+INT64_SQUARE_LIMIT = 3037000499
+
+def as_int64_array(numbers):
+    """Return numbers as an int64 array if every value is an integer whose
+    square fits in int64, otherwise None"""
+    a = np.asarray(numbers)
+    if a.ndim != 1 or a.dtype.kind not in 'iu':
+        return None
+    if a.size and (a.min() < -INT64_SQUARE_LIMIT or a.max() > INT64_SQUARE_LIMIT):
+        return None
+    return a.astype(np.int64, copy=False)
+
+def sum_of_squares_python(numbers):
+    # Exact for big integers and keeps floats as floats
+    if isinstance(numbers, np.ndarray):
+        numbers = numbers.tolist()
+    return sum(n * n for n in numbers)
 
 def sum_of_squares(numbers):
-    result = sum(n * n for n in numbers)
-    return result
+    if isinstance(numbers, range) and numbers.step == 1 and numbers.start >= 0:
+        return sum_of_squares_contiguous(numbers.start, numbers.stop - 1)
+    
+    # One-shot iterators (generators, map) are read once here, so the
+    # fallback below sees the same values as the int64 check
+    if not hasattr(numbers, '__len__'):
+        numbers = list(numbers)
+    a = as_int64_array(numbers)
+    if a is None:
+        return sum_of_squares_python(numbers)
+    
+    # Square and reduce in NumPy. Each square fits in int64, but the total for
+    # 10 million numbers does not, so the high and low 32-bit halves of the
+    # squares are summed separately and recombined as a Python int
+    squares = a * a
+    high = int((squares >> 32).sum())
+    low = int((squares & 0xFFFFFFFF).sum())
+    return (high << 32) + low
 
-def process_chunk(chunk):
+@njit(parallel=True, cache=True)
+def _sum_of_squares_halves(a):
+    # Same high/low split as sum_of_squares; prange spreads the loop over
+    # threads in one process and reduces both accumulators
+    high = 0
+    low = 0
+    for i in prange(a.shape[0]):
+        square = a[i] * a[i]
+        high += square >> 32
+        low += square & 0xFFFFFFFF
+    return high, low
+
+def sum_of_squares_parallel(numbers):
+    # One-shot iterators (generators, map) are read once here, so the
+    # fallback below sees the same values as the int64 check
+    if not hasattr(numbers, '__len__'):
+        numbers = list(numbers)
+    a = as_int64_array(numbers)
+    if a is None:
+        return sum_of_squares_python(numbers)
+    high, low = _sum_of_squares_halves(a)
+    return (int(high) << 32) + int(low)
+
+# Shared-memory block holding the input, attached once per worker
+_shared = None
+
+def attach_shared(name):
+    global _shared
+    _shared = shared_memory.SharedMemory(name=name)
+
+def process_chunk(bounds):
+    # Workers get only (start, stop) and view the shared array in place,
+    # so no chunk data is pickled
+    start, stop = bounds
+    chunk = np.ndarray((stop - start,), dtype=np.int64, buffer=_shared.buf,
+                       offset=start * np.dtype(np.int64).itemsize)
     start_time = time.time()
     result = sum_of_squares(chunk)
     duration = time.time() - start_time
     print(f"Processed chunk of size {len(chunk)}: result = {result} (took {duration:.4f} seconds)")
     return result
 
-def split_list(data, num_chunks):
-    chunk_size = math.ceil(len(data) / num_chunks)
-    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+def split_range(length, num_chunks):
+    # (start, stop) index pairs covering 0..length in near-equal chunks
+    edges = np.linspace(0, length, num_chunks + 1, dtype=np.int64)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:])]
 
 if __name__ == "__main__":
-    numbers = list(range(1, 10000001))  # 10 million numbers
+    count = 10000000  # 10 million numbers
+    shm = shared_memory.SharedMemory(create=True, size=count * np.dtype(np.int64).itemsize)
+    numbers = np.ndarray((count,), dtype=np.int64, buffer=shm.buf)
+    numbers[:] = np.arange(1, count + 1, dtype=np.int64)
     
     num_processes = multiprocessing.cpu_count()
     
     print(f"Using {num_processes} processes to process {len(numbers)} numbers")
     
-    chunks = split_list(numbers, num_processes)
+    chunks = split_range(len(numbers), num_processes)
     
     start_time = time.time()
     
-    with multiprocessing.Pool(processes=num_processes) as pool:
+    with multiprocessing.Pool(processes=num_processes, initializer=attach_shared,
+                              initargs=(shm.name,)) as pool:
         results = pool.map(process_chunk, chunks)
     
     total = sum(results)
@@ -42,4 +126,26 @@ if __name__ == "__main__":
     seq_time = time.time() - seq_start
     print(f"\nSequential result: {seq_result}")
     print(f"Sequential processing time: {seq_time:.4f} seconds")
-    print(f"Speedup factor: {seq_time/total_time:.2f}x")
\ No newline at end of file
+    print(f"Speedup factor: {seq_time/total_time:.2f}x")
+    
+    # Numba: parallel threads in this process, no pickling of chunks.
+    # Warm up first so compilation isn't timed
+    sum_of_squares_parallel(numbers[:1])
+    jit_start = time.time()
+    jit_result = sum_of_squares_parallel(numbers)
+    jit_time = time.time() - jit_start
+    print(f"\nNumba parallel result: {jit_result}")
+    print(f"Numba parallel processing time: {jit_time:.4f} seconds")
+    print(f"Speedup factor: {seq_time/jit_time:.2f}x")
+    
+    # The input is 1..count, so the answer also has a closed form
+    closed_start = time.time()
+    closed_result = sum_of_squares(range(1, count + 1))
+    closed_time = time.time() - closed_start
+    print(f"\nClosed-form result: {closed_result}")
+    print(f"Closed-form processing time: {closed_time:.6f} seconds")
+    
+    # Drop the view before releasing the shared block
+    del numbers
+    shm.close()
+    shm.unlink()
\ No newline at end of file
@@ -1,14 +1,18 @@
 import asyncio
 import aiohttp
 import time
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.etree import ParserError
 
 async def fetch_url(session, url):
     print(f"Fetching {url}")
     start_time = time.time()
     try:
         async with session.get(url) as response:
-            html = await response.text()
+            # Raw bytes: lxml rejects str input that carries an encoding
+            # declaration (e.g. XHTML's <?xml ...?>). The header charset is
+            # kept for pages that don't declare their encoding in the markup
+            html = await response.read()
             duration = time.time() - start_time
             print(f"Fetched {url} in {duration:.2f} seconds")
             return {
@@ -16,7 +20,8 @@ async def fetch_url(session, url):
                 "status": response.status,
                 "content_length": len(html),
                 "duration": duration,
-                "html": html
+                "html": html,
+                "charset": response.charset
             }
     except Exception as e:
         duration = time.time() - start_time
@@ -33,14 +38,26 @@ async def extract_title(html_data):
     if html_data.get("status") == "error":
         return {"url": url, "title": "N/A (Error)", "links_count": 0}
     
-    soup = BeautifulSoup(html_data["html"], 'html.parser')
-    title = soup.title.text if soup.title else "No title found"
-    links = soup.find_all('a')
+    # libxml2 parses the page and counts anchors in C, without building a
+    # Python object per link
+    parser = None
+    charset = html_data.get("charset")
+    if charset:
+        try:
+            parser = lxml.html.HTMLParser(encoding=charset)
+        except LookupError:
+            # Unknown charset in the header; let libxml2 detect it
+            pass
+    try:
+        root = lxml.html.fromstring(html_data["html"], parser=parser)
+    except ParserError:
+        return {"url": url, "title": "No title found", "links_count": 0}
+    title = root.findtext('.//title')
     
     return {
         "url": url,
-        "title": title,
-        "links_count": len(links)
+        "title": title if title is not None else "No title found",
+        "links_count": int(root.xpath('count(//a)'))
     }
 
 async def scrape_website(url):
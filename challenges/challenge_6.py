@@ -13,35 +13,37 @@ class AsyncRateLimiter:
         """
         self.max_calls = max_calls
         self.time_period = time_period
-        self.calls = []
-        self._lock = asyncio.Lock()
+        # Token bucket: holds up to max_calls tokens and refills at
+        # max_calls / time_period tokens per second
+        self.rate = max_calls / time_period
+        self.tokens = max_calls
+        self.last_refill = time.monotonic()
+    
+    def _refill(self, now):
+        elapsed = now - self.last_refill
+        self.tokens = min(self.max_calls, self.tokens + elapsed * self.rate)
+        self.last_refill = now
     
     async def acquire(self):
         """
         Acquire permission to proceed. If the rate limit is exceeded,
         this will wait until a slot becomes available.
         """
-        async with self._lock:
-            now = time.time()
-            
-            # Remove timestamps that are older than our time period
-            self.calls = [timestamp for timestamp in self.calls 
-                         if timestamp > now - self.time_period]
+        # Nothing between the refill and taking a token awaits, so each check
+        # is atomic on the event loop and no lock is needed. Waiters sleep
+        # independently and re-check when they wake.
+        while True:
+            self._refill(time.monotonic())
             
-            # If we're at the limit, wait until the oldest call expires
-            if len(self.calls) >= self.max_calls:
-                oldest_call = self.calls[0]
-                wait_time = oldest_call + self.time_period - now
-                if wait_time > 0:
-                    print(f"Rate limit reached. Waiting {wait_time:.2f} seconds...")
-                    await asyncio.sleep(wait_time)
-                    # After waiting, we need to clean up old timestamps again
-                    now = time.time()
-                    self.calls = [timestamp for timestamp in self.calls 
-                                 if timestamp > now - self.time_period]
+            # A whole token is available: spend it and proceed
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
             
-            # Add the current timestamp and allow the call
-            self.calls.append(now)
+            # Otherwise wait until the bucket has refilled one token
+            wait_time = (1 - self.tokens) / self.rate
+            print(f"Rate limit reached. Waiting {wait_time:.2f} seconds...")
+            await asyncio.sleep(wait_time)
 
 async def perform_task(task_id, rate_limiter):
     """Simulated task that requires rate limiting"""
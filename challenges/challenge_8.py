@@ -1,8 +1,16 @@
 # Challenge 8: Factorial function with pytest parametrization
 
+import math
+from functools import lru_cache
+
+@lru_cache(maxsize=1024)
+def _factorial(n):
+    # Only reached with validated input, so bad arguments never get cached
+    return math.factorial(n)
+
 def factorial(n):
     """
-    Calculate the factorial of a number using recursion.
+    Calculate the factorial of a number.
     
     Args:
         n: A non-negative integer
@@ -22,12 +30,9 @@ def factorial(n):
     if n < 0:
         raise ValueError("Factorial is not defined for negative numbers")
     
-    # Base cases
-    if n == 0 or n == 1:
-        return 1
-    
-    # Recursive case
-    return n * factorial(n - 1)
+    # math.factorial runs in C and has no recursion limit; repeated
+    # arguments are served from the cache
+    return _factorial(n)
 
 # If this file is run directly, demonstrate the function
 if __name__ == "__main__":
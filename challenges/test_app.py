@@ -143,4 +143,17 @@ def test_create_item_validation():
         "price": 10.0,
         "quantity": -5
     })
-    assert response.status_code == 422
\ No newline at end of file
+    assert response.status_code == 422
+
+def test_deleted_item_id_is_not_reused():
+    """Test that IDs keep increasing after the newest item is deleted"""
+    new_item = {
+        "name": "Temporary Item",
+        "price": 10.0,
+        "quantity": 1
+    }
+    first_id = client.post("/items", json=new_item).json()["id"]
+    client.delete(f"/items/{first_id}")
+    
+    second_id = client.post("/items", json=new_item).json()["id"]
+    assert second_id > first_id
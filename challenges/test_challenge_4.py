@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+from challenge_4 import sum_of_squares, sum_of_squares_parallel
+
+@pytest.mark.parametrize("func", [sum_of_squares, sum_of_squares_parallel])
+def test_int64_input(func):
+    assert func(np.arange(1, 1001, dtype=np.int64)) == 1000 * 1001 * 2001 // 6
+    assert func([3, -4]) == 25
+
+@pytest.mark.parametrize("func", [sum_of_squares, sum_of_squares_parallel])
+def test_int_generator(func):
+    assert func(x for x in [1, 2, 3]) == 14
+
+@pytest.mark.parametrize("func", [sum_of_squares, sum_of_squares_parallel])
+def test_float_generator(func):
+    assert func(x for x in [1.5, 2.5]) == 8.5
+
+@pytest.mark.parametrize("func", [sum_of_squares, sum_of_squares_parallel])
+def test_big_int_generator(func):
+    assert func(x for x in [2**40, 3]) == 2**80 + 9
+
+@pytest.mark.parametrize("func", [sum_of_squares, sum_of_squares_parallel])
+def test_values_past_int64_square_limit(func):
+    assert func([3_100_000_000, -3_100_000_000]) == 2 * 3_100_000_000**2
+
+def test_contiguous_range_uses_closed_form():
+    assert sum_of_squares(range(1, 10_000_001)) == 333333383333335000000
+    assert sum_of_squares(range(-3, 3)) == 19
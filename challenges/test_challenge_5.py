@@ -0,0 +1,37 @@
+import asyncio
+from challenge_5 import extract_title
+
+def run_extract(html, charset=None):
+    return asyncio.run(extract_title({"url": "https://example.com", "status": 200,
+                                      "html": html, "charset": charset}))
+
+def test_extract_title_html():
+    result = run_extract(b"<html><head><title>Example</title></head>"
+                         b"<body><a href='/a'>A</a><a href='/b'>B</a></body></html>")
+    assert result == {"url": "https://example.com", "title": "Example", "links_count": 2}
+
+def test_extract_title_xhtml_with_encoding_declaration():
+    html = ('<?xml version="1.0" encoding="utf-8"?>\n'
+            '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" '
+            '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">\n'
+            '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Café</title></head>'
+            '<body><a href="/a">A</a></body></html>').encode("utf-8")
+    result = run_extract(html)
+    assert result["title"] == "Café"
+    assert result["links_count"] == 1
+
+def test_extract_title_charset_from_header_only():
+    html = "<html><head><title>Café</title></head><body></body></html>".encode("utf-8")
+    assert run_extract(html, charset="utf-8")["title"] == "Café"
+
+def test_extract_title_unknown_header_charset():
+    html = b"<html><head><title>Example</title></head></html>"
+    assert run_extract(html, charset="not-a-charset")["title"] == "Example"
+
+def test_extract_title_missing_title_and_empty_page():
+    assert run_extract(b"<html><body><p>No links</p></body></html>")["title"] == "No title found"
+    assert run_extract(b"") == {"url": "https://example.com", "title": "No title found", "links_count": 0}
+
+def test_extract_title_error_result():
+    result = asyncio.run(extract_title({"url": "https://example.com", "status": "error"}))
+    assert result == {"url": "https://example.com", "title": "N/A (Error)", "links_count": 0}